@@ -1,11 +1,18 @@
 from ClashLib.Simulation import GameState, GameTimeline, Event
 from ClashLib.MultiplayerConection import P2P
 from ClashLib.Menu import Menu
-from ClashLib.Entities import Entity, Caballero, Mago, Mosquetera, Tower, TowerType
-from ClashLib.utils import screen_to_grid
+from ClashLib.Entities import Entity, EntityTable, EntityType, Caballero, Mago, Mosquetera, Tower, TowerType, PROJECTILE_POOL
+from ClashLib.utils import swap_remove_inactive, morton_code, splitmix64
 import pygame
 import sys
-import random
+import threading
+
+# Clase de entidad que crea cada carta
+ENTITY_CLASSES = {
+    "Caballero": Caballero,
+    "Mago": Mago,
+    "Mosquetera": Mosquetera,
+}
 
 class Board(GameState): 
     """
@@ -13,20 +20,46 @@ class Board(GameState):
     So it will contain information about the positions of units, buildings, and other game elements.
     """
     
-    def __init__(self, player_id=None):
+    def __init__(self, player_id=None, debug=False):
         super().__init__()
+        self.debug = debug  # imprime trazas de depuración
         self.width = 18
         self.height = 32
         self.cell_size = 20
         self.entities: list[Entity] = []
         self.player_id = player_id
         self.new_entities = []
+        self.targets = EntityTable()  # Tropas y torres atacables, reconstruido cada tick
         self.towers = []
-        self.obstacles = set()  # Set de coordenadas de celdas bloqueadas
+        self.troops = []  # Tropas vivas (subconjunto de entities), para no filtrar por tipo cada tick
+        self.obstacles = [[False] * self.width for _ in range(self.height)]  # obstacles[fila][columna] es True si la celda está bloqueada
+        self.background = None  # Superficie con el fondo estático (se crea en el primer render)
+
+        # Variación de color del césped por celda (-2..2 por canal), calculada una
+        # sola vez a partir de un hash del código Morton de la celda. El código Morton
+        # es biyectivo, así que no hay dos celdas con la misma semilla (el antiguo
+        # random.seed(x^2+y^2) usaba XOR y repetía semillas, p. ej. en (0,1) y (1,0))
+        color_variation = 2
+        self.color_jitter = [
+            [
+                tuple(splitmix64(morton_code(columna, fila) * 3 + canal) % (2 * color_variation + 1) - color_variation for canal in range(3))
+                for columna in range(self.width)
+            ]
+            for fila in range(self.height)
+        ]
+
+        # Filas donde el jugador puede colocar cartas
+        if player_id == "1":
+            self.my_area_rows = range(0, 16)  # Área del jugador 1 (superior)
+        elif player_id == "2":
+            self.my_area_rows = range(16, 32)  # Área del jugador 2 (inferior)
+        else:
+            self.my_area_rows = range(0)
         
         # Inicializar obstáculos y torres
         self.setup_obstacles()
         self.setup_towers()
+        self.count_towers()
 
 
     def is_my_area(self, grid_position):
@@ -36,81 +69,70 @@ class Board(GameState):
         Para el jugador 2, el área es la mitad inferior (filas 16-31).
         """
         columna, fila = grid_position
-        
-        if self.player_id == "1":
-            return 0 <= fila < 16  # Área del jugador 1 (superior)
-        elif self.player_id == "2":
-            return 16 <= fila < 32  # Área del jugador 2 (inferior)
-        return False
+        return fila in self.my_area_rows
 
 
+    def count_towers(self):
+        """
+        Cuenta las torres vivas de cada jugador. Solo se llama cuando cambia la lista de torres.
+        """
+        self.my_tower_count = sum(1 for tower in self.towers if str(tower.owner) == str(self.player_id))
+        self.opponent_tower_count = len(self.towers) - self.my_tower_count
+
     def win_condition(self):
         """
         Define the win condition for the game.
         """
-        # printear los ids de las torres para debug
-        print(self.player_id)
-        for tower in self.towers:
-            print(f"Tower ID: {tower.owner}, Life: {tower.life}")  # Debugging line
-        my_towers = [tower for tower in self.towers if str(tower.owner) == str(self.player_id)]
-        opponent_towers = [tower for tower in self.towers if str(tower.owner) != str(self.player_id)]
-
-        print(f"My towers: {len(my_towers)}, Opponent towers: {len(opponent_towers)}")  # Debugging line
-        
-        if not my_towers:
+        if self.my_tower_count == 0:
             return "lose"
-        elif not opponent_towers:
+        elif self.opponent_tower_count == 0:
             return "win"
         return "continue"
 
+    def block_cells(self, filas, columnas):
+        """
+        Marca como bloqueadas todas las celdas del rectángulo filas x columnas.
+        """
+        for fila in filas:
+            for columna in columnas:
+                self.obstacles[fila][columna] = True
+
     def setup_obstacles(self):
         """
         Configura los obstáculos del mapa: agua y torres.
-        Las coordenadas son en formato (columna, fila) o (x, y) en la grid.
+        self.obstacles es una grilla de booleanos indexada como [fila][columna].
         """
         # Limpiar obstáculos previos
-        self.obstacles.clear()
+        for fila in self.obstacles:
+            fila[:] = [False] * self.width
         
         # AGUA (Río) - filas 15 y 16 (2 casillas de altura)
-        for fila in range(15, 17):  # filas 15, 16
-            for columna in range(18):
-                # Excluir puentes
-                # Puente izquierdo: columnas 2-4
-                # Puente derecho: columnas 13-15
-                if not ((columna >= 2 and columna <= 4) or (columna >= 13 and columna <= 15)):
-                    self.obstacles.add((columna, fila))
+        # Excluir puentes
+        # Puente izquierdo: columnas 2-4
+        # Puente derecho: columnas 13-15
+        self.block_cells(range(15, 17), range(0, 2))
+        self.block_cells(range(15, 17), range(5, 13))
+        self.block_cells(range(15, 17), range(16, 18))
         
         # TORRES SUPERIORES (Jugador 1)
         # Torre principal superior: 4x4, filas 1-4, columnas 7-10
-        for fila in range(1, 5):
-            for columna in range(7, 11):
-                self.obstacles.add((columna, fila))
+        self.block_cells(range(1, 5), range(7, 11))
         
         # Torre izquierda superior: 3x3, filas 5-7, columnas 2-4
-        for fila in range(5, 8):
-            for columna in range(2, 5):
-                self.obstacles.add((columna, fila))
+        self.block_cells(range(5, 8), range(2, 5))
         
         # Torre derecha superior: 3x3, filas 5-7, columnas 13-15
-        for fila in range(5, 8):
-            for columna in range(13, 16):
-                self.obstacles.add((columna, fila))
+        self.block_cells(range(5, 8), range(13, 16))
         
         # TORRES INFERIORES (Jugador 2)
         # Torre principal inferior: 4x4, filas 27-30, columnas 7-10
-        for fila in range(27, 31):
-            for columna in range(7, 11):
-                self.obstacles.add((columna, fila))
+        self.block_cells(range(27, 31), range(7, 11))
         
         # Torre izquierda inferior: 3x3, filas 24-26, columnas 2-4
-        for fila in range(24, 27):
-            for columna in range(2, 5):
-                self.obstacles.add((columna, fila))
+        self.block_cells(range(24, 27), range(2, 5))
         
         # Torre derecha inferior: 3x3, filas 24-26, columnas 13-15
-        for fila in range(24, 27):
-            for columna in range(13, 16):
-                self.obstacles.add((columna, fila))
+        self.block_cells(range(24, 27), range(13, 16))
 
     def setup_towers(self):
         """
@@ -149,41 +171,54 @@ class Board(GameState):
             return False
         
         # Verificar si está en un obstáculo
-        if (columna, fila) in self.obstacles:
+        if self.obstacles[fila][columna]:
             return False
         
         return True
 
-    def add_new_entity(self, entity):
-        self.new_entities.append(entity)
-
     def update(self, tick_time):
-        # update de todos
-        for entity in self.entities:
-            entity.update(tick_time, self.entities)        
+        # Se mantienen dos pasadas: todas las entidades deciden (update) sobre el
+        # mismo estado antes de que cualquiera se mueva o haga daño (execute).
+        entities = self.entities
+        targets = self.targets
+        obstacles = self.obstacles
+        add_entity = self.new_entities.append
+
+        # update de todos; solo tropas y torres pueden ser objetivo
+        targets.rebuild(self.towers, self.troops)
+        for entity in entities:
+            entity.update(tick_time, targets)
 
         # excecute de todos
-        for entity in self.entities:
-            entity.execute(tick_time, self.obstacles, self.add_new_entity)
+        for entity in entities:
+            entity.execute(tick_time, obstacles, add_entity)
 
-        # eliminar los inactivos
-        self.entities = [e for e in self.entities if e.active]
-        self.towers = [t for t in self.towers if t.active]
+        # eliminar los inactivos; los proyectiles vuelven al pool para reutilizarse
+        swap_remove_inactive(self.entities, PROJECTILE_POOL.release)
+        swap_remove_inactive(self.troops)
+        tower_count = len(self.towers)
+        swap_remove_inactive(self.towers)
+        if len(self.towers) != tower_count:
+            self.count_towers()
 
         # añadir nuevas entidades generadas
+        # se vacía en el sitio: el mismo buffer se reutiliza en cada tick
         if self.new_entities:
             self.entities.extend(self.new_entities)
-            self.new_entities = []
+            self.new_entities.clear()
 
-    def render(self, screen):
+    def render_background(self):
         """
-        Renderiza el tablero con césped, agua, puentes y torres.
+        Pre-renderiza el césped, agua y puentes en una superficie.
+        El patrón nunca cambia, así que se dibuja una sola vez.
         """
+        # Un píxel RGB por celda en un buffer de bytes; luego se sube a una
+        # superficie y se escala al tamaño real en una sola operación
+        pixels = bytearray()
+        grass_colors = ((163, 197, 71), (174, 206, 77))  # patrón de tablero de ajedrez, por paridad de la celda
+
         for fila in range(self.height):
             for columna in range(self.width):
-                x = columna * self.cell_size
-                y = fila * self.cell_size
-                
                 # Determinar el tipo de celda
                 es_rio = 15 <= fila <= 16
                 es_puente = es_rio and ((2 <= columna <= 4) or (13 <= columna <= 15))
@@ -193,51 +228,68 @@ class Board(GameState):
                     # Agua en azul
                     color = (33, 150, 243)
                 else:
-                    # Césped - patrón de tablero de ajedrez
-                    if (columna + fila) % 2 == 0:
-                        color = (163, 197, 71)
-                    else:
-                        color = (174, 206, 77)
-                    
-                    # Variación de color para más naturalidad
-                    color_variation = 2
-                    random.seed(x^2 + y^2)
-                    color = (
-                        random.randint(max(0, color[0] - color_variation), min(255, color[0] + color_variation)),
-                        random.randint(max(0, color[1] - color_variation), min(255, color[1] + color_variation)),
-                        random.randint(max(0, color[2] - color_variation), min(255, color[2] + color_variation))
-                    )
-                
-                # Dibujar celda
-                pygame.draw.rect(screen, color, (x, y, self.cell_size, self.cell_size))
+                    # Césped con variación de color para más naturalidad; los canales
+                    # base están lejos de 0 y 255, así que no hace falta recortar
+                    r, g, b = grass_colors[(columna + fila) & 1]
+                    jr, jg, jb = self.color_jitter[fila][columna]
+                    color = (r + jr, g + jg, b + jb)
                 
-                # Dibujar borde sutil
-                pygame.draw.rect(screen, (100, 100, 100), (x, y, self.cell_size, self.cell_size), 1)
+                pixels.extend(color)
+
+        cells = pygame.image.frombuffer(bytes(pixels), (self.width, self.height), "RGB")
+        pixel_width = self.width * self.cell_size
+        pixel_height = self.height * self.cell_size
+        background = pygame.transform.scale(cells, (pixel_width, pixel_height)).convert()
+
+        # Dibujar borde sutil: una baldosa con el contorno de una celda, estampada
+        # sobre todas las celdas en una sola llamada a blits
+        border = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+        pygame.draw.rect(border, (100, 100, 100), (0, 0, self.cell_size, self.cell_size), 1)
+        background.blits(
+            [(border, (columna * self.cell_size, fila * self.cell_size)) for fila in range(self.height) for columna in range(self.width)],
+            doreturn=0
+        )
+
+        return background
+
+    def render(self, screen):
+        """
+        Renderiza el tablero con césped, agua, puentes y torres.
+        """
+        # El fondo necesita que la ventana ya exista; si nadie lo creó antes, se crea aquí
+        if self.background is None:
+            self.background = self.render_background()
+
+        screen.blit(self.background, (0, 0))
         
-        # Renderizar entidades
+        # Renderizar entidades: primero las torres y luego el resto, porque al
+        # eliminar con swap-remove el orden de self.entities cambia y una tropa
+        # podría quedar dibujada debajo de una torre
+        cell_size = self.cell_size
+        for tower in self.towers:
+            tower.render(screen, cell_size=cell_size)
         for entity in self.entities:
-            entity.render(screen, cell_size=self.cell_size)
+            if entity.type is not EntityType.TOWER:
+                entity.render(screen, cell_size=cell_size)
 
     def position_to_grid(self, position):
-        return screen_to_grid(position[0], position[1], self.cell_size)
+        # las posiciones del mouse son enteras: basta la división entera
+        return (position[0] // self.cell_size, position[1] // self.cell_size)
 
     def create_entity_by_type(self, entity_type, position, player_id):
-        float_pos = (position[0], position[1])
-        if entity_type == "Caballero":
-            return Caballero(float_pos[0], float_pos[1], player_id)
-        elif entity_type == "Mago":
-            return Mago(float_pos[0], float_pos[1], player_id)
-        elif entity_type == "Mosquetera":
-            return Mosquetera(float_pos[0], float_pos[1], player_id) 
-        else: 
+        entity_class = ENTITY_CLASSES.get(entity_type)
+        if entity_class is None:
             return None
+        return entity_class(position[0], position[1], player_id)
 
     def add_entity(self, entity_type, grid_position, player_id):
-        print(f"Adding entity of type {entity_type} at grid position {grid_position}")
         entity = self.create_entity_by_type(entity_type, grid_position, player_id)
-        if entity is not None:
-            print(f"Entity created: {entity}")
-            self.entities.append(entity)
+        if entity is None:
+            return
+        if self.debug:
+            print(f"Entity of type {entity_type} created: {entity}")
+        self.entities.append(entity)
+        self.troops.append(entity)
 
 
 
@@ -245,8 +297,9 @@ class ClashSimulation(GameTimeline):
     """
     ClashSimulation class that extends GameTimeline to manage the timeline of events specific to Clash Royale.
     """
-    def __init__(self, tick_time=1/24):
+    def __init__(self, tick_time=1/24, debug=False):
         super().__init__(tick_time)
+        self.debug = debug  # imprime trazas de depuración
 
 
     def process_event(self, event, game_state):
@@ -255,53 +308,77 @@ class ClashSimulation(GameTimeline):
         This method is intended to be overridden by subclasses to provide specific event processing logic.
         """
 
-        print(f"Processing event: {event.event_type} at simulation time {self.simulation_time}, apparition time {event.aparition_time}")
+        if self.debug:
+            print(f"Processing event: {event.event_type} at simulation time {self.simulation_time}, apparition time {event.aparition_time}")
 
         # debo procesar el evento si su tiempo de aparicion ya paso
         if event.event_type == "spawn_unit":
-            print(f"Spawning unit with data: {event.data}")
+            if self.debug:
+                print(f"Spawning unit with data: {event.data}")
             entity_type = event.data.get("entity_type")
             grid_position = event.data.get("grid_position")
             player_id = event.data.get("player_id")
 
             if entity_type is not None and grid_position is not None:
                 game_state.add_entity(entity_type, grid_position, player_id)
-                print(f"Spawned {entity_type} at {grid_position} for player {player_id}")
+                if self.debug:
+                    print(f"Spawned {entity_type} at {grid_position} for player {player_id}")
         
 
 
 class Clash:
-    def __init__(self, player_id):
+    def __init__(self, player_id, debug=False):
         self.player_id = player_id
+        self.debug = debug  # imprime trazas de depuración
         self.width = 18
         self.height = 32
         self.tick_time = 1/25 # para evitar flotantes raros
+        self.fps = 60 # límite de frames renderizados por segundo
+        self.max_ticks_per_frame = 25 # máximo de ticks simulados entre dos renders
         self.connected = False
-        self.board = Board(player_id=self.player_id)
-        self.simulation = ClashSimulation(tick_time=self.tick_time)
+        self.board = Board(player_id=self.player_id, debug=debug)
+        self.simulation = ClashSimulation(tick_time=self.tick_time, debug=debug)
         self.menu = Menu(player_id=self.player_id)
         self.p2p = P2P(local_test=True, on_connect=self.on_connect, on_receive=self.on_receive)
         self.total_ticks = 0
         self.initial_timestamp = None
 
+        # Geometría en píxeles: el menú ocupa 8 filas debajo del tablero
+        cell_size = self.board.cell_size
+        self.menu_position = (0, self.board.height * cell_size)
+        self.menu_size = (self.board.width * cell_size, 8 * cell_size)
+        self.screen_size = (self.menu_size[0], self.menu_position[1] + self.menu_size[1])
+        self.board_rect = pygame.Rect(0, 0, self.board.width * cell_size, self.board.height * cell_size)
+        self.menu_rect = pygame.Rect(self.menu_position, self.menu_size)
+        self.menu_state = None # (carta seleccionada, elixir) del último menú enviado a la ventana
+        self.board_dirty = True # el tablero solo cambia al simular ticks o al hacer clic
+
         # Pygame setup
         
         pygame.init()
-        self.screen = pygame.display.set_mode(
-                (self.board.width*20, 
-                (self.board.height*1.25)*20)
-             )
+        self.screen = pygame.display.set_mode(self.screen_size)
         pygame.display.set_caption("Clash Royale AR: Player " + str(self.player_id))
+        # con la ventana creada ya se puede pre-renderizar el fondo del tablero
+        self.board.background = self.board.render_background()
         self.clock = pygame.time.Clock()
         self.running = True
 
+        # Estado del intento de conexión (ver poll_connection)
+        self.max_connection_tries = 5
+        self.retry_delay_ms = 2000
+        self.connection_tries = 0
+        self.connection_thread = None # hilo del intento en curso, None si no hay ninguno
+        self.next_retry_time = 0 # pygame.time.get_ticks() a partir del cual se puede reintentar
+        self.hosts = [] # hosts descubiertos que aún no fallaron (solo jugador 2)
+
     def on_receive(self, data, addr):
         event = Event.from_json(data['data'])
 
         if event is not None:
             self.simulation.add_event(event)
-            print(event.aparition_time - self.p2p.initial_timestamp)
-            print(self.simulation.simulation_time)
+            if self.debug:
+                print(event.aparition_time - self.p2p.initial_timestamp)
+                print(self.simulation.simulation_time)
 
     def on_connect(self, addr):
         print(f"Connected to peer at {addr}")
@@ -309,25 +386,47 @@ class Clash:
         self.menu.set_game_start_time(self.p2p.get_synced_time())
         self.total_ticks = 0
         self.initial_timestamp = self.menu.game_start_time
+        self.board_dirty = True
 
     def make_connection(self):
         print(f"Making connection for player {self.player_id}")
         if self.player_id == "1":
             self.p2p.start_peer_host()
         elif self.player_id == "2":
-            hosts = self.p2p.get_hosts()
-            if not hosts:
-                print("No hosts found. Exiting.")
-                sys.exit(1)
-            self.p2p.connect_as_peer_client(hosts[0])
+            # La búsqueda escucha broadcasts durante segundos: solo se repite
+            # cuando ya se probaron todos los hosts encontrados
+            if not self.hosts:
+                self.hosts = self.p2p.get_hosts()
+            if not self.hosts:
+                # el intento cuenta como fallido; poll_connection decide si se reintenta
+                print("No hosts found.")
+                return
+            if not self.p2p.connect_as_peer_client(self.hosts[0]):
+                self.hosts.pop(0)
 
     def render(self):
-        
-        self.screen.fill((0, 255, 0))
-
-        self.board.render(self.screen)
-        self.menu.render(self.screen, position=(0, self.board.height*20), size=(self.board.width*20, 8*20))
-        pygame.display.flip()
+        # No hace falta limpiar la pantalla: el fondo del tablero y el del menú
+        # cubren toda la ventana. Lo que no cambió desde el último frame queda
+        # tal cual en la ventana y no se vuelve a dibujar.
+        dirty_rects = []
+
+        if self.board_dirty:
+            self.board.render(self.screen)
+            if self.menu.selected_card is not None:
+                self.menu.render_danger_area(self.screen)
+            self.board_dirty = False
+            dirty_rects.append(self.board_rect)
+
+        # El menú solo cambia con la selección o el elixir (que se queda fijo
+        # en el máximo)
+        menu_state = (self.menu.selected_card, self.menu.elixir)
+        if menu_state != self.menu_state:
+            self.menu.render(self.screen, position=self.menu_position, size=self.menu_size)
+            self.menu_state = menu_state
+            dirty_rects.append(self.menu_rect)
+
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
 
     def get_initial_timestamp(self):
         if self.initial_timestamp is None:
@@ -378,7 +477,7 @@ class Clash:
                 print("No hay carta seleccionada o no hay suficiente elixir")
 
     def handle_menu_click(self, mouse_pos):
-        self.menu.handle_click(mouse_pos, (0, self.board.height*20), (self.board.width*20, 8*20))
+        self.menu.handle_click(mouse_pos, self.menu_position, self.menu_size)
 
     def handle_inputs(self):
         for event in pygame.event.get():
@@ -386,12 +485,15 @@ class Clash:
                 pygame.quit()
                 sys.exit(0)
             elif event.type == pygame.MOUSEBUTTONDOWN:
+                # un clic puede cambiar la selección y con ella la zona de peligro
+                self.board_dirty = True
                 mouse_pos = pygame.mouse.get_pos()
                 grid_pos = self.board.position_to_grid(mouse_pos)
 
-                print(grid_pos)
+                if self.debug:
+                    print(grid_pos)
 
-                if self.menu.chords_inside_menu(mouse_pos, (0, self.board.height*20), (self.board.width*20, 8*20)):
+                if self.menu.chords_inside_menu(mouse_pos, self.menu_position, self.menu_size):
                     self.handle_menu_click(mouse_pos)
                 else:
                     self.handle_board_click(grid_pos)
@@ -410,39 +512,69 @@ class Clash:
             pygame.quit()
             sys.exit(0)
 
-        #print(f"Updating game state for player {self.player_id}")
+        # un solo instante sincronizado por frame para simulación y elixir
+        current_synced_time = self.p2p.get_synced_time()
 
-        expected_total_ticks = int((self.p2p.get_synced_time() - self.menu.game_start_time) / self.tick_time)
-        ticks_to_process = expected_total_ticks - self.total_ticks
+        expected_total_ticks = int((current_synced_time - self.menu.game_start_time) / self.tick_time)
+        # si vamos muy atrasados, se reparte la recuperación entre varios frames
+        # para seguir renderizando y leyendo inputs (los ticks no se pierden)
+        ticks_to_process = min(expected_total_ticks - self.total_ticks, self.max_ticks_per_frame)
         
-        for _ in range(ticks_to_process):
-            self.simulation.execute_tick(self.board)
-            self.total_ticks += 1
+        if ticks_to_process > 0:
+            self.simulation.execute_ticks(self.board, ticks_to_process)
+            self.total_ticks += ticks_to_process
+            self.board_dirty = True
 
-        
-        current_synced_time = self.p2p.get_synced_time()
         self.menu.update_elixir_synced(current_synced_time)
-        
-        self.clock.tick(60)
-        self.render()
 
-    def try_connection(self):
-        tries = 0
-        while not self.connected and tries < 5:
-            self.make_connection()
-            tries += 1
-            if not self.connected:
+    def poll_connection(self):
+        """
+        Avanza la conexión sin bloquear. Cada intento (make_connection puede tardar
+        segundos buscando hosts) corre en un hilo; al terminar sin éxito se espera
+        retry_delay_ms antes del siguiente, hasta max_connection_tries intentos.
+        Devuelve True cuando ya hay conexión.
+        """
+        if self.connected:
+            return True
+
+        if self.connection_thread is not None:
+            if self.connection_thread.is_alive():
+                return False
+            self.connection_thread = None
+            if self.connected:
+                return True
+            self.next_retry_time = pygame.time.get_ticks() + self.retry_delay_ms
+            if self.connection_tries < self.max_connection_tries:
                 print("Retrying connection...")
-                pygame.time.delay(2000) 
 
-        if not self.connected:
+        if pygame.time.get_ticks() < self.next_retry_time:
+            return False
+
+        if self.connection_tries >= self.max_connection_tries:
             print("Failed to connect after multiple attempts. Exiting.")
             sys.exit(1)
 
+        self.connection_tries += 1
+        self.connection_thread = threading.Thread(target=self.make_connection, daemon=True)
+        self.connection_thread.start()
+        return False
+
+    def try_connection(self):
+        # Mientras se conecta la ventana sigue atendiendo eventos (se puede cerrar
+        # y el sistema no la marca como "no responde")
+        while not self.poll_connection():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit(0)
+            self.clock.tick(self.fps)
+
     def run(self):
         self.try_connection()
 
         while True:
             self.handle_inputs()
             self.update()
+            self.render()
+            self.clock.tick(self.fps)
 
@@ -1,14 +1,19 @@
-from abc import ABC, abstractmethod
 import math
 from enum import Enum
+from itertools import chain, count
 import pygame
 
-# ID global
-_next_entity_id = 0
-def get_next_id():
-    global _next_entity_id
-    _next_entity_id += 1
-    return _next_entity_id
+# ID global: 1, 2, 3... (el contador de itertools avanza en C, sin global ni frame Python)
+_id_counter = count(1)
+get_next_id = _id_counter.__next__
+
+
+# el owner puede venir como int o como str; se aceptan ambas formas
+PLAYER_ONE = frozenset((1, '1'))
+PLAYER_TWO = frozenset((2, '2'))
+
+# distancia (en celdas) a la que un proyectil se considera impactado
+HIT_TOLERANCE = 0.05
 
 
 # crear un enum para entity types
@@ -27,10 +32,205 @@ class StateType(Enum):
     MOVING = 'moving'
     ATTACKING = 'attacking'
 
-class Entity(ABC):
+# superficies pre-dibujadas que no cambian entre frames, compartidas por todas las entidades
+SPRITE_CACHE = {}
+
+# lienzo de los sprites de tropas y posicion del centro de la tropa dentro de el
+TROOP_SPRITE_SIZE = (32, 40)
+TROOP_SPRITE_ANCHOR = (16, 24)
+
+# fuente de las etiquetas; se crea en el primer render (pygame.font ya esta inicializado)
+ENTITY_FONT = None
+
+
+def get_entity_font():
+    """
+    Return the shared 24px default font, loading it on first use.
+    """
+    global ENTITY_FONT
+    if ENTITY_FONT is None:
+        ENTITY_FONT = pygame.font.Font(None, 24)
+    return ENTITY_FONT
+
+
+def get_label(text, color):
+    """
+    Return the rendered surface for a fixed label (e.g. "P1", "K"), cached in SPRITE_CACHE.
+    """
+    key = ("label", text, color)
+    surface = SPRITE_CACHE.get(key)
+    if surface is None:
+        surface = SPRITE_CACHE[key] = get_entity_font().render(text, True, color)
+    return surface
+
+# desplazamientos a las 8 celdas vecinas
+NEIGHBOR_OFFSETS = [(i, j) for i in range(-1, 2) for j in range(-1, 2) if not (i == 0 and j == 0)]
+
+class EntityTable:
+    """
+    Snapshot of the targetable entities (troops and towers) rebuilt once per tick.
+    Positions are kept in parallel columns so target searches read plain lists
+    instead of going through every entity's attributes; owners need no column,
+    since each owner has its own grid.
+    Entities are also bucketed in a uniform grid of `bucket_size` cells, one grid
+    per owner, so queries only visit the buckets around the query point and
+    enemy searches never look at friendly entities.
+    Iterating the table yields the entities themselves.
+    """
+    def __init__(self, bucket_size=4):
+        self.bucket_size = bucket_size
+        self.entities = []
+        self.xs = []
+        self.ys = []
+        self.buckets = {}  # owner -> {(bx, by) -> indices into the columns}
+        self.max_bucket = (0, 0)
+
+    def rebuild(self, *groups):
+        """
+        Refill the table from the given groups of entities (the board passes its
+        tower and troop lists, so no type filtering is needed here).
+        """
+        # las listas se vacían y se reutilizan de un tick al siguiente
+        self.entities.clear()
+        self.xs.clear()
+        self.ys.clear()
+        for owner_buckets in self.buckets.values():
+            for bucket in owner_buckets.values():
+                bucket.clear()
+        max_bx = max_by = 0
+        size = self.bucket_size
+        # metodos y dicts en locales: el bucle no repite las busquedas de atributos
+        entities = self.entities
+        add_entity = entities.append
+        add_x = self.xs.append
+        add_y = self.ys.append
+        buckets = self.buckets
+        i = 0
+
+        # una sola pasada llena las columnas y los buckets
+        for e in chain.from_iterable(groups):
+            if not e.active:
+                continue
+            x, y, owner = e.x, e.y, e.owner
+            add_entity(e)
+            add_x(x)
+            add_y(y)
+
+            owner_buckets = buckets.get(owner)
+            if owner_buckets is None:
+                owner_buckets = buckets[owner] = {}
+            bx, by = int(x) // size, int(y) // size
+            bucket = owner_buckets.get((bx, by))
+            if bucket is None:
+                owner_buckets[(bx, by)] = [i]
+            else:
+                bucket.append(i)
+            if bx > max_bx:
+                max_bx = bx
+            if by > max_by:
+                max_by = by
+            i += 1
+        self.max_bucket = (max_bx, max_by)
+
+    def __iter__(self):
+        return iter(self.entities)
+
+    def __len__(self):
+        return len(self.entities)
+
+    def _ring(self, bx, by, r, grids):
+        """
+        Yield the indices stored in the buckets of `grids` at Chebyshev distance r from (bx, by).
+        """
+        if r == 0:
+            keys = [(bx, by)]
+        else:
+            # solo los buckets dentro de [0, max_bucket]: fuera de ahi no hay entidades
+            max_bx, max_by = self.max_bucket
+            xs = range(max(bx - r, 0), min(bx + r, max_bx) + 1)
+            ys = range(max(by - r + 1, 0), min(by + r - 1, max_by) + 1)
+            keys = []
+            if by - r >= 0:
+                keys += [(i, by - r) for i in xs]
+            if by + r <= max_by:
+                keys += [(i, by + r) for i in xs]
+            if bx - r >= 0:
+                keys += [(bx - r, j) for j in ys]
+            if bx + r <= max_bx:
+                keys += [(bx + r, j) for j in ys]
+        for key in keys:
+            for grid in grids:
+                bucket = grid.get(key)
+                if bucket:
+                    yield from bucket
+
+    def nearest_enemy(self, x, y, owner, max_dist_sq=None):
+        """
+        Return the closest entity not owned by `owner` (or None).
+        Buckets are visited in rings around (x, y); once the best candidate is
+        closer than anything an outer ring could hold, the search stops.
+        If `max_dist_sq` is given, only entities within that squared distance
+        count and rings beyond it are never visited.
+        """
+        size = self.bucket_size
+        bx, by = int(x) // size, int(y) // size
+        max_ring = max(bx, by, self.max_bucket[0] - bx, self.max_bucket[1] - by)
+        enemy_grids = [grid for grid_owner, grid in self.buckets.items() if grid_owner != owner]
+
+        best = -1
+        best_dist = float('inf')
+        limit = float('inf') if max_dist_sq is None else max_dist_sq
+        if not enemy_grids:
+            return None
+        xs, ys = self.xs, self.ys
+        for r in range(max_ring + 1):
+            for i in self._ring(bx, by, r, enemy_grids):
+                dx = xs[i] - x
+                dy = ys[i] - y
+                dist = dx * dx + dy * dy
+                if dist < best_dist and dist <= limit:
+                    best_dist = dist
+                    best = i
+            # everything beyond ring r is at least r * size away
+            reach = (r * size) ** 2
+            if best_dist <= reach or limit < reach:
+                break
+        # solo se vuelve a la lista de objetos para el indice ganador
+        return self.entities[best] if best >= 0 else None
+
+    def enemies_within(self, x, y, radius, owner):
+        """
+        Return the entities not owned by `owner` whose position lies within
+        `radius` of (x, y). The exact check compares squared distances read
+        straight from the position columns.
+        """
+        size = self.bucket_size
+        radius_sq = radius * radius
+        xs, ys, entities = self.xs, self.ys, self.entities
+        enemy_grids = [grid for grid_owner, grid in self.buckets.items() if grid_owner != owner]
+        result = []
+        for bx in range(int(x - radius) // size, int(x + radius) // size + 1):
+            for by in range(int(y - radius) // size, int(y + radius) // size + 1):
+                for grid in enemy_grids:
+                    bucket = grid.get((bx, by))
+                    if not bucket:
+                        continue
+                    for i in bucket:
+                        dx = xs[i] - x
+                        dy = ys[i] - y
+                        if dx * dx + dy * dy <= radius_sq:
+                            result.append(entities[i])
+        return result
+
+
+class Entity:
     """
     This class represents a generic entity in the game.
+    Entities are created by the hundreds (projectiles especially), so every
+    class in the hierarchy declares __slots__ instead of carrying a __dict__.
     """
+    __slots__ = ('x', 'y', 'owner', 'entity_id', 'active', 'type', 'id_label')
+
     def __init__(self, cell_x, cell_y, owner, entity_type=EntityType.TROOP):
         """
         The coords are in function of the map grid, so it has min y max values:
@@ -47,6 +247,7 @@ class Entity(ABC):
         self.entity_id = get_next_id()  # Unique incremental ID
         self.active = True
         self.type = entity_type 
+        self.id_label = None # superficie con el entity_id, se rasteriza en el primer render
 
     def distance_to(self, other):
         """
@@ -72,6 +273,12 @@ class Entity(ABC):
         screen_x = self.x * cell_size
         screen_y = self.y * cell_size
         return (screen_x, screen_y)
+
+    def get_screen_pixel(self, cell_size):
+        """
+        Screen position truncated to whole pixels, for draw calls and blits.
+        """
+        return (int(self.x * cell_size), int(self.y * cell_size))
     
     def get_grid_position(self):
         """
@@ -79,57 +286,56 @@ class Entity(ABC):
         """
         return (int(self.x), int(self.y))
 
-    @abstractmethod 
     def update(self, tick_time, entities):
         """
         Update the entity state.
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def execute(self, tick_time, obstacles, add_entity):
         """
         Execute the entity's action.
         """
-        pass
+        raise NotImplementedError
 
     def render(self, screen, cell_size=20):
         """
         Render the entity on the given screen.
         """
 
-        screen_position = self.get_screen_position(cell_size)
+        x, y = self.get_screen_pixel(cell_size)
 
         radius = 10
 
 
         # si es id1 dibujar un circulo azul, si es id2 dibujar un circulo rojo
-        if (self.owner == 1 or self.owner == '1'):
-            pygame.draw.circle(screen, (0, 0, 255), (int(screen_position[0]), int(screen_position[1])), radius)
-        elif (self.owner == 2 or self.owner == '2'):
-            pygame.draw.circle(screen, (255, 0, 0), (int(screen_position[0]), int(screen_position[1])), radius)
+        if self.owner in PLAYER_ONE:
+            pygame.draw.circle(screen, (0, 0, 255), (x, y), radius)
+        elif self.owner in PLAYER_TWO:
+            pygame.draw.circle(screen, (255, 0, 0), (x, y), radius)
         
 
-        font = pygame.font.Font(None, 24)
-        text = font.render(f"{self.entity_id}", True, (255, 255, 255))
-        text_rect = text.get_rect(center=(int(screen_position[0]), int(screen_position[1])))
+        # el id no cambia: se rasteriza una vez por entidad
+        text = self.id_label
+        if text is None:
+            text = self.id_label = get_entity_font().render(f"{self.entity_id}", True, (255, 255, 255))
+        text_rect = text.get_rect(center=(x, y))
         screen.blit(text, text_rect)
 
         #renderizar el player id
-        p_text = font.render(f"P{self.owner}", True, (255, 255, 0))
-        p_text_rect = p_text.get_rect(center=(int(screen_position[0]), int(screen_position[1]) + 12))
+        p_text = get_label(f"P{self.owner}", (255, 255, 0))
+        p_text_rect = p_text.get_rect(center=(x, y + 12))
         screen.blit(p_text, p_text_rect)
 
 
-
-
-
-
 class Tower(Entity):
     """
     This class represents a tower in the game. It extends the Entity class
     and adds specific attributes for towers.
     """
+    __slots__ = ('tower_type', 'size', 'life', 'max_life', 'hit_speed', 'attack_range',
+                 'attack_range_sq', 'damage', 'cooldown', 'target', 'state')
+
     def __init__(self, cell_x, cell_y, owner, tower_type = TowerType.CENTRAL):
         super().__init__(cell_x, cell_y, owner, entity_type=EntityType.TOWER)
         self.tower_type = tower_type
@@ -138,13 +344,18 @@ class Tower(Entity):
         self.max_life = self.life
         self.hit_speed = 1 if tower_type == TowerType.CENTRAL else 0.8 # tiempo entre ataques
         self.attack_range = 7.5 + self.size/2
+        # distance_to descuenta el radio de la torre, asi que el alcance medido
+        # desde el centro es attack_range + size/2; se guarda al cuadrado
+        self.attack_range_sq = (self.attack_range + self.size / 2) ** 2
         self.damage = 109 if tower_type == TowerType.CENTRAL else 109
         self.cooldown = 0.0
         self.target : Troop | None = None # entidad objetivo
         self.state = StateType.IDLE
 
     def in_range(self, target):
-        return self.distance_to(target) <= self.attack_range
+        dx = target.x - self.x
+        dy = target.y - self.y
+        return dx * dx + dy * dy <= self.attack_range_sq
 
     def look_for_target(self, entities):
         """
@@ -154,40 +365,23 @@ class Tower(Entity):
         if self.state != StateType.IDLE:
             return
 
-        entities_copy = sorted(entities, key=lambda e: self.distance_to(e))
-
-        for entity in entities_copy:
-            if entity.owner == self.owner or not entity.active or entity.type not in [EntityType.TROOP, EntityType.TOWER]:
-                continue
-
-            if self.in_range(entity):
-                self.target = entity
-                break
+        # solo se buscan enemigos dentro del alcance de la torre
+        entity = entities.nearest_enemy(self.x, self.y, self.owner, self.attack_range_sq)
+        if entity:
+            self.target = entity
 
 
     def attack(self, add_entity=None):
         """
         Fire a projectile at the target.
         """
-        P = Projectile(self.x, self.y, self.owner, speed=5.0, target=self.target, damage=self.damage)
+        P = PROJECTILE_POOL.acquire(Projectile, self.x, self.y, self.owner, speed=5.0, target=self.target, damage=self.damage)
         if add_entity:
             add_entity(P)
 
     def can_i_attack(self, entities):
-        if self.tower_type != TowerType.CENTRAL: 
-            return True
-
-        if self.tower_type == TowerType.CENTRAL and self.life < self.max_life:
-            return True
-
-        if (self.tower_type == TowerType.CENTRAL):
-            me_owner = self.owner
-            for entity in entities:
-                if entity.owner == me_owner and entity.type == EntityType.TOWER and entity.tower_type != TowerType.CENTRAL:
-                    # entonces es mi torre y no es la central
-                    if entity.life <= 0:
-                        return True
-        return False
+        # la torre central solo se activa al recibir daño
+        return self.tower_type != TowerType.CENTRAL or self.life < self.max_life
 
     def update(self, tick_time, entities):
         if self.life <= 0:
@@ -224,33 +418,36 @@ class Tower(Entity):
 
     def render(self, screen, cell_size):
         # dibujar la torre como un circulo dependiendo de su tipo
-        screen_position = self.get_screen_position(cell_size)
+        x, y = self.get_screen_pixel(cell_size)
         radius = int(self.size * cell_size / 2)
         if self.tower_type == TowerType.CENTRAL:
-            color = (0, 0, 255) if self.owner in [1, '1'] else (255, 0, 0)
+            color = (0, 0, 255) if self.owner in PLAYER_ONE else (255, 0, 0)
         else:
-            color = (0, 100, 255) if self.owner in [1, '1'] else (255, 100, 0)
-
-        # dibuajar circulo con transparencia
-        s = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, color + (200,), (radius, radius), radius)
-        screen.blit(s, (int(screen_position[0]) - radius, int(screen_position[1]) - radius))
+            color = (0, 100, 255) if self.owner in PLAYER_ONE else (255, 100, 0)
+
+        # dibuajar circulo con transparencia (la superficie se crea una vez y se reutiliza)
+        key = ("tower", radius, color)
+        s = SPRITE_CACHE.get(key)
+        if s is None:
+            s = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(s, color + (200,), (radius, radius), radius)
+            s = s.convert_alpha()
+            SPRITE_CACHE[key] = s
+        screen.blit(s, (x - radius, y - radius))
 
         # dibujar rey o princesa
-        font = pygame.font.Font(None, 24)
-        if self.tower_type == TowerType.CENTRAL:
-            text = font.render("K", True, (255, 255, 255))
-        else:
-            text = font.render("P", True, (255, 255, 255))
-        text_rect = text.get_rect(center=(int(screen_position[0]), int(screen_position[1])))
+        text = get_label("K" if self.tower_type == TowerType.CENTRAL else "P", (255, 255, 255))
+        text_rect = text.get_rect(center=(x, y))
         screen.blit(text, text_rect)
-        # dibujar barra de vida
+        # dibujar barra de vida (rectángulos sólidos: fill va directo a SDL_FillRect)
         bar_width = radius * 2
         bar_height = 5
+        bar_x = x - radius
+        bar_y = y - radius - 10
         health_percent = max(0, self.life / self.max_life)
-        pygame.draw.rect(screen, (50, 50, 50), (int(screen_position[0]) - radius, int(screen_position[1]) - radius - 10, bar_width, bar_height))
+        screen.fill((50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
         health_color = (0, 255, 0) if health_percent > 0.5 else (255, 255, 0) if health_percent > 0.25 else (255, 0, 0)
-        pygame.draw.rect(screen, health_color, (int(screen_position[0]) - radius, int(screen_position[1]) - radius - 10, int(bar_width * health_percent), bar_height))
+        screen.fill(health_color, (bar_x, bar_y, int(bar_width * health_percent), bar_height))
 
     def distance_to(self, other):
         # consider my radius
@@ -258,23 +455,39 @@ class Tower(Entity):
         return effective_distance
 
 
-class Troop(Entity, ABC):
+class Troop(Entity):
     """
     Base class for all troops. Contains common logic for moving and attacking.
+    Stats that are only read when attacking or drawing (max_life, damage,
+    hit_speed, projectile_speed) are class attributes shared by every unit of
+    a kind; those read every tick (speed, range) stay in per-instance slots,
+    which are cheaper to load.
     """
+    __slots__ = ('life', 'speed', 'range', 'range_sq',
+                 'target', 'cooldown', 'state', 'delay', 'waypoint_key', 'waypoint',
+                 'heading_wp', 'heading_x', 'heading_y', 'heading_left')
 
-    def __init__(self, cell_x, cell_y, life, owner, damage, speed, range, hit_speed, target=None):
+    max_life = 0
+    damage = 0
+    hit_speed = 0.0 # tiempo entre ataques
+
+    def __init__(self, cell_x, cell_y, owner, speed, range, target=None):
         super().__init__(cell_x, cell_y, owner)
-        self.life = life
-        self.max_life = life
-        self.damage = damage
+        self.life = self.max_life
         self.speed = speed # cells per second
         self.range = range
-        self.hit_speed = hit_speed
+        self.range_sq = range * range
         self.target = target
         self.cooldown = 0.0
         self.state = StateType.IDLE
         self.delay = 1.0
+        self.waypoint_key = None # (celda propia, posicion del target) del ultimo waypoint calculado
+        self.waypoint = None
+        # direccion unitaria hacia heading_wp y distancia que falta; solo se recalcula al cambiar de waypoint
+        self.heading_wp = None
+        self.heading_x = 0.0
+        self.heading_y = 0.0
+        self.heading_left = 0.0
 
     # se debe sobreescribir para tropas como el ariete
     def look_for_target(self, entities):
@@ -283,62 +496,76 @@ class Troop(Entity, ABC):
         """
         if self.state == StateType.ATTACKING:
             return
-        
-        entities_copy = sorted(entities, key=lambda e: self.distance_to(e))
-
-        for entity in entities_copy:
-            if entity.owner == self.owner or not entity.active or entity.type not in [EntityType.TROOP, EntityType.TOWER]:
-                continue
 
+        entity = entities.nearest_enemy(self.x, self.y, self.owner)
+        if entity:
             self.target = entity
-            break
 
 
-    @abstractmethod
     def attack(self, add_entity=None):
         """
         Attack the target entity. 
         Should return a Projectile or None (if melee attack).
         """
-        pass
+        raise NotImplementedError
 
     def in_range(self, target):
         """
         Check if target is within attack range.
         """
-        if target.type == EntityType.TOWER:
-            return target.distance_to(self) <= self.range
-
-        return self.distance_to(target) <= self.range
+        dx = target.x - self.x
+        dy = target.y - self.y
+        if target.type is EntityType.TOWER:
+            # se mide hasta el borde de la torre, no hasta su centro
+            reach = self.range + target.size / 2
+            return dx * dx + dy * dy <= reach * reach
+
+        return dx * dx + dy * dy <= self.range_sq
     
     def get_valid_waypoints(self, obstacles, map_width = 18, map_height = 32):
         muajaja = []
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                if i == 0 and j == 0:
-                    continue
-                new_x = int(self.x) + i 
-                new_y = int(self.y) + j 
-                if 0 <= new_x < map_width and 0 <= new_y < map_height:
-                    if (new_x, new_y) not in obstacles:
-                        muajaja.append((new_x + 0.5, new_y + 0.5))
+        cell_x, cell_y = int(self.x), int(self.y)
+        for i, j in NEIGHBOR_OFFSETS:
+            new_x = cell_x + i 
+            new_y = cell_y + j 
+            if 0 <= new_x < map_width and 0 <= new_y < map_height:
+                if not obstacles[new_y][new_x]:
+                    muajaja.append((new_x + 0.5, new_y + 0.5))
         return muajaja
 
 
-    def get_target_waypoint(self, obstacles):
+    def get_target_waypoint(self, obstacles, map_width = 18, map_height = 32):
+        """
+        Pick the free neighbouring cell center closest to the target.
+        Same candidates as get_valid_waypoints, but scanned in a single loop
+        with squared distances and without building the intermediate list.
+        """
         if not self.target:
             return
         
-        valid_waypoint = self.get_valid_waypoints(obstacles)
+        target_x, target_y = self.target.x, self.target.y
+        cell_x, cell_y = int(self.x), int(self.y)
+
+        # los obstaculos no cambian: si ni mi celda ni el target se movieron, el waypoint es el mismo
+        key = (cell_x, cell_y, target_x, target_y)
+        if key == self.waypoint_key:
+            return self.waypoint
 
         target_wp = None
         min_dist = float('inf')
-        for wp in valid_waypoint:
-            dist = self.target.distance_to_point(wp)
-            if dist < min_dist:
-                min_dist = dist
-                target_wp = wp
-
+        for i, j in NEIGHBOR_OFFSETS:
+            new_x = cell_x + i
+            new_y = cell_y + j
+            if 0 <= new_x < map_width and 0 <= new_y < map_height and not obstacles[new_y][new_x]:
+                dx = target_x - new_x - 0.5
+                dy = target_y - new_y - 0.5
+                dist = dx * dx + dy * dy
+                if dist < min_dist:
+                    min_dist = dist
+                    target_wp = (new_x + 0.5, new_y + 0.5)
+
+        self.waypoint_key = key
+        self.waypoint = target_wp
         return target_wp
 
 
@@ -349,19 +576,28 @@ class Troop(Entity, ABC):
         target_wp = self.get_target_waypoint(obstacles)
         if not target_wp:
             return
-        
-        dx = target_wp[0] - self.x
-        dy = target_wp[1] - self.y
-
-        max_dist = math.hypot(dx, dy)
 
-        try_dist = self.speed * ticket_time
-        if try_dist > max_dist:
-            try_dist = max_dist
-    
-
-        self.x += dx / max_dist * try_dist
-        self.y += dy / max_dist * try_dist
+        # hacia un mismo waypoint se avanza en linea recta: el vector unitario no cambia
+        if target_wp != self.heading_wp:
+            dx = target_wp[0] - self.x
+            dy = target_wp[1] - self.y
+            dist = math.hypot(dx, dy)
+            self.heading_wp = target_wp
+            self.heading_left = dist
+            if dist < 1e-6:
+                self.heading_x = self.heading_y = 0.0
+            else:
+                self.heading_x = dx / dist
+                self.heading_y = dy / dist
+
+        step = self.speed * ticket_time
+        if step >= self.heading_left:
+            self.x, self.y = target_wp
+            self.heading_left = 0.0
+        else:
+            self.x += self.heading_x * step
+            self.y += self.heading_y * step
+            self.heading_left -= step
 
 
     def update(self, tick_time, entities):
@@ -375,25 +611,28 @@ class Troop(Entity, ABC):
             self.delay -= tick_time
             return None
 
-        if self.target and self.in_range(self.target) and self.target.life > 0:
+        # un target muerto se descarta antes de medir el rango
+        target = self.target
+        if target is not None and (target.life <= 0 or not target.active):
+            self.target = None
+            self.state = StateType.MOVING
+        elif target is not None and self.in_range(target):
             self.state = StateType.ATTACKING
         else:
             self.state = StateType.MOVING
 
-        if self.target and (self.target.life <= 0 or not self.target.active):
-            self.target = None
-            self.state = StateType.MOVING
-
         self.look_for_target(entities)
 
     def execute(self, tick_time, obstacles, add_entity):
-        if self.state == StateType.ATTACKING:
+        # los miembros de un Enum son unicos: basta comparar identidad
+        state = self.state
+        if state is StateType.ATTACKING:
             self.cooldown -= tick_time
             if self.cooldown <= 0:
                 self.attack(self.target, add_entity=add_entity)
                 self.cooldown = self.hit_speed
 
-        elif self.state == StateType.MOVING:
+        elif state is StateType.MOVING:
             self.move_towards(obstacles, tick_time)
     
     def receive_damage(self, amount):
@@ -420,12 +659,47 @@ class Troop(Entity, ABC):
             pygame.draw.polygon(screen, (255, 255, 0), [end_pos, arrow_point1, arrow_point2])
         pass
 
+    def draw_body(self, surface, x, y):
+        """
+        Draw the static body of the troop centered on (x, y).
+        Only called once per troop kind and side to build the cached sprite.
+        """
+        raise NotImplementedError
+
+    def blit_sprite(self, screen, x, y):
+        """
+        Blit the cached body sprite for this troop kind and side centered on (x, y).
+        The body never changes, so draw_body runs once onto a transparent surface
+        and every frame is a single blit.
+        """
+        key = ("troop", type(self), self.owner in PLAYER_ONE)
+        sprite = SPRITE_CACHE.get(key)
+        anchor_x, anchor_y = TROOP_SPRITE_ANCHOR
+        if sprite is None:
+            sprite = pygame.Surface(TROOP_SPRITE_SIZE, pygame.SRCALPHA)
+            self.draw_body(sprite, anchor_x, anchor_y)
+            sprite = SPRITE_CACHE[key] = sprite.convert_alpha()
+        screen.blit(sprite, (x - anchor_x, y - anchor_y))
+
+    def _render_health_bar(self, screen, x, y, bar_width, bar_height):
+        """
+        Draw a bar_width x bar_height health bar centered horizontally on x, with its top at y.
+        """
+        health_percent = max(0, self.life / self.max_life)
+        bar_x = x - bar_width // 2
+        # rectángulos sólidos: fill va directo a SDL_FillRect
+        screen.fill((50, 50, 50), (bar_x, y, bar_width, bar_height))
+        health_color = (0, 255, 0) if health_percent > 0.5 else (255, 255, 0) if health_percent > 0.25 else (255, 0, 0)
+        screen.fill(health_color, (bar_x, y, int(bar_width * health_percent), bar_height))
+
 
 class Spell(Entity):
     """
     This class represents a spell in the game. It extends the Entity class
     and adds specific attributes for spells.
     """
+    __slots__ = ('duration', 'damage', 'radius')
+
     def __init__(self, cell_x, cell_y, owner, duration, damage, radius):
         super().__init__(cell_x, cell_y, owner, entity_type=EntityType.SPELL)
         self.duration = duration
@@ -447,6 +721,8 @@ class Projectile(Entity):
     This class represents a projectile in the game. It extends the Entity class
     and adds specific attributes for projectiles.
     """
+    __slots__ = ('speed', 'target', 'damage', 'max_duration', 'elapsed_time', 'reached_target', 'target_x', 'target_y')
+
     def __init__(self, cell_x, cell_y, owner, speed, target, damage):
         super().__init__(cell_x, cell_y, owner, entity_type=EntityType.PROJECTILE)
         self.speed = speed # cells per second
@@ -455,26 +731,38 @@ class Projectile(Entity):
         self.max_duration = 5.0
         self.elapsed_time = 0.0
         self.reached_target = False
-        self.target_pos = (target.x, target.y) if target else None
+        # punto al que se apunta, en dos floats para no crear una tupla por tick
+        self.target_x, self.target_y = (target.x, target.y) if target else (self.x, self.y)
 
     def move_towards(self, tick_time):
-        dx = self.target_pos[0] - self.x
-        dy = self.target_pos[1] - self.y
-        max_dist = math.hypot(dx, dy)
+        """
+        Advance one tick towards (target_x, target_y) and return whether the projectile arrived.
+        A single hypot and one scale factor per tick; on arrival (within
+        HIT_TOLERANCE after the step) the projectile snaps onto the target.
+        """
+        target_x = self.target_x
+        target_y = self.target_y
+        dx = target_x - self.x
+        dy = target_y - self.y
+        dist = math.hypot(dx, dy)
+        step = self.speed * tick_time
 
-        try_dist = self.speed * tick_time
-        if try_dist >= max_dist:
+        if dist - step < HIT_TOLERANCE:
+            self.x = target_x
+            self.y = target_y
             self.reached_target = True
-            try_dist = max_dist
-
-        if max_dist < 1e-6:
-            return
+            return True
 
-        self.x += dx / max_dist * try_dist
-        self.y += dy / max_dist * try_dist
+        scale = step / dist
+        self.x += dx * scale
+        self.y += dy * scale
+        return False
 
     def update(self, tick_time, entities):
-        self.target_pos = (self.target.x, self.target.y) if self.target else self.target_pos
+        target = self.target
+        if target is not None:
+            self.target_x = target.x
+            self.target_y = target.y
 
 
     def execute(self, tick_time, obstacles, add_entity):
@@ -482,12 +770,7 @@ class Projectile(Entity):
             return
         
         self.elapsed_time += tick_time
-        self.move_towards(tick_time)
-
-        dx = self.target_pos[0] - self.x
-        dy = self.target_pos[1] - self.y
-
-        if (math.hypot(dx, dy) < 0.05 or self.reached_target) and self.target and self.target.active:
+        if self.move_towards(tick_time) and self.target and self.target.active:
             self.target.receive_damage(self.damage)
             self.active = False
         if self.elapsed_time > self.max_duration:
@@ -495,31 +778,32 @@ class Projectile(Entity):
         
     def render(self, screen, cell_size=20):
         # dibujar una bolita pequeña negra
-        screen_position = self.get_screen_position(cell_size)
         radius = 4
-        pygame.draw.circle(screen, (50,50,50), (int(screen_position[0]), int(screen_position[1])), radius)
+        pygame.draw.circle(screen, (50,50,50), self.get_screen_pixel(cell_size), radius)
 
 class AreaProjectile(Projectile):
     """
     This class represents an Area Projectile in the game. It extends the Projectile class
     and adds specific attributes for Area Projectiles.
     """
+    __slots__ = ('radius', 'radius_sq', 'troops_hit')
+
     def __init__(self, cell_x, cell_y, owner, speed, target, damage, radius):
         super().__init__(cell_x=cell_x, cell_y=cell_y, owner=owner, speed=speed, target=target, damage=damage)
         self.radius = radius
-        self.troops_hit : list[Troop] = []
+        self.radius_sq = radius * radius
+        # entity_id -> entidad: pertenencia O(1) y orden de insercion estable entre peers
+        self.troops_hit : dict[int, Troop] = {}
 
     def update(self, tick_time, entities):
         # calcula cuanto avanza y si ya esta muy cerca dle obejtivo llena trops_hit
         dx = self.target.x - self.x
         dy = self.target.y - self.y
-        dist = math.hypot(dx, dy)
-        if dist < self.radius:
-            for entity in entities:
-                if entity.owner != self.owner and entity.active and entity.type in [EntityType.TROOP, EntityType.TOWER]:
-                    if math.hypot(entity.x - self.x, entity.y - self.y) <= self.radius:
-                        if entity not in self.troops_hit:
-                            self.troops_hit.append(entity)
+        if dx * dx + dy * dy < self.radius_sq:
+            # la tabla solo contiene tropas y torres activas
+            troops_hit = self.troops_hit
+            for entity in entities.enemies_within(self.x, self.y, self.radius, self.owner):
+                troops_hit.setdefault(entity.entity_id, entity)
         
 
     def execute(self, tick_time, obstacles, add_entity):
@@ -527,13 +811,8 @@ class AreaProjectile(Projectile):
             return
         
         self.elapsed_time += tick_time
-        self.move_towards(tick_time)
-
-        dx = self.target_pos[0] - self.x
-        dy = self.target_pos[1] - self.y
-
-        if (math.hypot(dx, dy) < 0.05 or self.reached_target):
-            for troop in self.troops_hit:
+        if self.move_towards(tick_time):
+            for troop in self.troops_hit.values():
                 if troop.active:
                     troop.receive_damage(self.damage)
             self.active = False
@@ -542,119 +821,145 @@ class AreaProjectile(Projectile):
     
     def render(self, screen, cell_size=20):
         # dibujar una bolita grande naranja
-        screen_position = self.get_screen_position(cell_size)
         radius = 18
-        pygame.draw.circle(screen, (255,165,0), (int(screen_position[0]), int(screen_position[1])), radius, 2)
+        pygame.draw.circle(screen, (255,165,0), self.get_screen_pixel(cell_size), radius, 2)
+
+
+class ProjectilePool:
+    """
+    Free list of finished projectiles, one list per projectile class.
+    Towers and ranged troops fire constantly; instead of allocating a new
+    object per shot, acquire() re-runs __init__ on a released instance.
+    """
+    def __init__(self):
+        self.free = {}  # clase -> instancias inactivas listas para reutilizar
+
+    def acquire(self, cls, *args, **kwargs):
+        """
+        Return an initialized projectile of class `cls`, reusing a released one if available.
+        """
+        free = self.free.get(cls)
+        if free:
+            projectile = free.pop()
+            projectile.__init__(*args, **kwargs)
+            return projectile
+        return cls(*args, **kwargs)
+
+    def release(self, entity):
+        """
+        Give back an entity that has left the board. Non-projectiles are ignored.
+        Must only be called once the entity is no longer in any entity list.
+        """
+        if isinstance(entity, Projectile):
+            entity.target = None # no retener tropas muertas mientras espera
+            self.free.setdefault(type(entity), []).append(entity)
+
+
+PROJECTILE_POOL = ProjectilePool()
 
 
 class Mosquetera(Troop):
-    def __init__(self, cell_x, cell_y, owner, target=None, projectile_speed=15.0):
-        super().__init__(cell_x=cell_x, cell_y=cell_y, life=721, owner=owner, damage=217, speed=1.0, range=6, hit_speed=1.0, target=target)
-        self.projectile_speed = projectile_speed
+    __slots__ = ()
+
+    max_life = 721
+    damage = 217
+    hit_speed = 1.0
+    projectile_speed = 15.0
+
+    def __init__(self, cell_x, cell_y, owner, target=None):
+        super().__init__(cell_x=cell_x, cell_y=cell_y, owner=owner, speed=1.0, range=6, target=target)
 
     def attack(self, target, add_entity):
-        P = Projectile(self.x, self.y, self.owner, speed=self.projectile_speed, target=target, damage=self.damage)
+        P = PROJECTILE_POOL.acquire(Projectile, self.x, self.y, self.owner, speed=self.projectile_speed, target=target, damage=self.damage)
         if add_entity:
             add_entity(P)
         return P
     
-    def render(self, screen, cell_size):
-        screen_pos = self.get_screen_position(cell_size)
-        x, y = int(screen_pos[0]), int(screen_pos[1])
-        
+    def draw_body(self, surface, x, y):
         # Color base según el jugador
-        base_color = (100, 150, 255) if self.owner in [1, '1'] else (255, 100, 100)
-        dark_color = (50, 100, 200) if self.owner in [1, '1'] else (200, 50, 50)
+        base_color = (100, 150, 255) if self.owner in PLAYER_ONE else (255, 100, 100)
+        dark_color = (50, 100, 200) if self.owner in PLAYER_ONE else (200, 50, 50)
         
         # Cuerpo (vestido triangular)
         body_points = [(x, y - 8), (x - 6, y + 6), (x + 6, y + 6)]
-        pygame.draw.polygon(screen, base_color, body_points)
-        pygame.draw.polygon(screen, dark_color, body_points, 2)
+        pygame.draw.polygon(surface, base_color, body_points)
+        pygame.draw.polygon(surface, dark_color, body_points, 2)
         
         # Cabeza
-        pygame.draw.circle(screen, (255, 220, 177), (x, y - 10), 4)
-        pygame.draw.circle(screen, (0, 0, 0), (x, y - 10), 4, 1)
+        pygame.draw.circle(surface, (255, 220, 177), (x, y - 10), 4)
+        pygame.draw.circle(surface, (0, 0, 0), (x, y - 10), 4, 1)
         
         # Cabello (ponytail)
-        pygame.draw.circle(screen, (139, 69, 19), (x - 4, y - 11), 3)
-        pygame.draw.circle(screen, (139, 69, 19), (x + 4, y - 11), 3)
+        pygame.draw.circle(surface, (139, 69, 19), (x - 4, y - 11), 3)
+        pygame.draw.circle(surface, (139, 69, 19), (x + 4, y - 11), 3)
         
         # Arma (mosquete)
-        weapon_angle = -45 if self.owner in [1, '1'] else 45
+        weapon_angle = -45 if self.owner in PLAYER_ONE else 45
         weapon_end_x = x + 8 * math.cos(math.radians(weapon_angle))
         weapon_end_y = y + 8 * math.sin(math.radians(weapon_angle))
-        pygame.draw.line(screen, (80, 50, 30), (x + 2, y), (weapon_end_x, weapon_end_y), 3)
-        
-        # Barra de vida
-        self._render_health_bar(screen, x, y - 18, cell_size)
+        pygame.draw.line(surface, (80, 50, 30), (x + 2, y), (weapon_end_x, weapon_end_y), 3)
+
+    def render(self, screen, cell_size):
+        x, y = self.get_screen_pixel(cell_size)
+        self.blit_sprite(screen, x, y)
 
-    def _render_health_bar(self, screen, x, y, cell_size):
-        bar_width = 20
-        bar_height = 3
-        health_percent = max(0, self.life / self.max_life)
-        
-        # Fondo de la barra
-        pygame.draw.rect(screen, (50, 50, 50), (x - bar_width//2, y, bar_width, bar_height))
         # Barra de vida
-        health_color = (0, 255, 0) if health_percent > 0.5 else (255, 255, 0) if health_percent > 0.25 else (255, 0, 0)
-        pygame.draw.rect(screen, health_color, (x - bar_width//2, y, int(bar_width * health_percent), bar_height))
+        self._render_health_bar(screen, x, y - 18, 20, 3)
 
 
 class Mago(Troop):
-    def __init__(self, cell_x, cell_y, owner, target=None, projectile_speed=10.0):
-        super().__init__(cell_x=cell_x, cell_y=cell_y, life=755, owner=owner, damage=281, speed=1.0, range=5.5, hit_speed=1.4, target=target)
-        self.projectile_speed = projectile_speed
+    __slots__ = ()
+
+    max_life = 755
+    damage = 281
+    hit_speed = 1.4
+    projectile_speed = 10.0
+
+    def __init__(self, cell_x, cell_y, owner, target=None):
+        super().__init__(cell_x=cell_x, cell_y=cell_y, owner=owner, speed=1.0, range=5.5, target=target)
 
     def attack(self, target, add_entity):
-        P = AreaProjectile(self.x, self.y, self.owner, speed=self.projectile_speed, target=target, damage=self.damage, radius=1.5)
+        P = PROJECTILE_POOL.acquire(AreaProjectile, self.x, self.y, self.owner, speed=self.projectile_speed, target=target, damage=self.damage, radius=1.5)
         if add_entity:
             add_entity(P)
         return P
     
-    def render(self, screen, cell_size):
-        screen_pos = self.get_screen_position(cell_size)
-        x, y = int(screen_pos[0]), int(screen_pos[1])
-        
+    def draw_body(self, surface, x, y):
         # Color mágico según el jugador
-        magic_color = (138, 43, 226) if self.owner in [1, '1'] else (255, 20, 147)
-        robe_color = (75, 0, 130) if self.owner in [1, '1'] else (139, 0, 69)
+        magic_color = (138, 43, 226) if self.owner in PLAYER_ONE else (255, 20, 147)
+        robe_color = (75, 0, 130) if self.owner in PLAYER_ONE else (139, 0, 69)
         
         # Túnica (cuerpo)
         robe_points = [(x, y - 8), (x - 7, y + 7), (x + 7, y + 7)]
-        pygame.draw.polygon(screen, robe_color, robe_points)
-        pygame.draw.polygon(screen, magic_color, robe_points, 2)
+        pygame.draw.polygon(surface, robe_color, robe_points)
+        pygame.draw.polygon(surface, magic_color, robe_points, 2)
         
         # Cabeza
-        pygame.draw.circle(screen, (255, 220, 177), (x, y - 10), 4)
-        pygame.draw.circle(screen, (0, 0, 0), (x, y - 10), 4, 1)
+        pygame.draw.circle(surface, (255, 220, 177), (x, y - 10), 4)
+        pygame.draw.circle(surface, (0, 0, 0), (x, y - 10), 4, 1)
         
         # Sombrero puntiagudo de mago
         hat_points = [(x - 5, y - 13), (x, y - 22), (x + 5, y - 13)]
-        pygame.draw.polygon(screen, robe_color, hat_points)
-        pygame.draw.polygon(screen, magic_color, hat_points, 1)
+        pygame.draw.polygon(surface, robe_color, hat_points)
+        pygame.draw.polygon(surface, magic_color, hat_points, 1)
         
         # Estrella mágica en el sombrero
         star_y = y - 17
-        pygame.draw.circle(screen, (255, 255, 100), (x, star_y), 2)
+        pygame.draw.circle(surface, (255, 255, 100), (x, star_y), 2)
         
         # Báculo mágico
         staff_end_y = y + 10
-        pygame.draw.line(screen, (139, 90, 43), (x - 5, y - 3), (x - 5, staff_end_y), 2)
+        pygame.draw.line(surface, (139, 90, 43), (x - 5, y - 3), (x - 5, staff_end_y), 2)
         # Orbe mágico en la punta
-        pygame.draw.circle(screen, magic_color, (x - 5, y - 5), 3)
-        pygame.draw.circle(screen, (255, 255, 255), (x - 5, y - 5), 3, 1)
-        
-        # Barra de vida
-        self._render_health_bar(screen, x, y - 25, cell_size)
+        pygame.draw.circle(surface, magic_color, (x - 5, y - 5), 3)
+        pygame.draw.circle(surface, (255, 255, 255), (x - 5, y - 5), 3, 1)
 
-    def _render_health_bar(self, screen, x, y, cell_size):
-        bar_width = 20
-        bar_height = 3
-        health_percent = max(0, self.life / self.max_life)
-        
-        pygame.draw.rect(screen, (50, 50, 50), (x - bar_width//2, y, bar_width, bar_height))
-        health_color = (0, 255, 0) if health_percent > 0.5 else (255, 255, 0) if health_percent > 0.25 else (255, 0, 0)
-        pygame.draw.rect(screen, health_color, (x - bar_width//2, y, int(bar_width * health_percent), bar_height))
+    def render(self, screen, cell_size):
+        x, y = self.get_screen_pixel(cell_size)
+        self.blit_sprite(screen, x, y)
+
+        # Barra de vida
+        self._render_health_bar(screen, x, y - 25, 20, 3)
 
 
 class Caballero(Troop):
@@ -662,39 +967,42 @@ class Caballero(Troop):
     This class represents a Caballero troop in the game. It extends the Troop class
     and adds specific attributes for Caballeros.
     """
+    __slots__ = ()
+
+    max_life = 1766
+    damage = 202
+    hit_speed = 1.2
+
     def __init__(self, cell_x, cell_y, owner, target=None):
-        super().__init__(cell_x=cell_x, cell_y=cell_y, life=1766, owner=owner, damage=202, speed=1.0, range=1.0, hit_speed=1.2, target=target)
+        super().__init__(cell_x=cell_x, cell_y=cell_y, owner=owner, speed=1.0, range=1.0, target=target)
 
     def attack(self, target, add_entity=None):
         if target.life > 0:
             target.receive_damage(self.damage)
 
-    def render(self, screen, cell_size):
-        screen_pos = self.get_screen_position(cell_size)
-        x, y = int(screen_pos[0]), int(screen_pos[1])
-        
+    def draw_body(self, surface, x, y):
         # Colores según el jugador
-        armor_color = (192, 192, 192) if self.owner in [1, '1'] else (169, 169, 169)
-        accent_color = (0, 100, 200) if self.owner in [1, '1'] else (200, 0, 0)
+        armor_color = (192, 192, 192) if self.owner in PLAYER_ONE else (169, 169, 169)
+        accent_color = (0, 100, 200) if self.owner in PLAYER_ONE else (200, 0, 0)
         
         # Cuerpo del caballero (rectángulo para armadura)
-        pygame.draw.rect(screen, armor_color, (x - 6, y - 4, 12, 10))
-        pygame.draw.rect(screen, (100, 100, 100), (x - 6, y - 4, 12, 10), 1)
+        pygame.draw.rect(surface, armor_color, (x - 6, y - 4, 12, 10))
+        pygame.draw.rect(surface, (100, 100, 100), (x - 6, y - 4, 12, 10), 1)
         
         # Detalles de armadura (líneas)
-        pygame.draw.line(screen, accent_color, (x - 4, y - 2), (x - 4, y + 4), 1)
-        pygame.draw.line(screen, accent_color, (x + 4, y - 2), (x + 4, y + 4), 1)
+        pygame.draw.line(surface, accent_color, (x - 4, y - 2), (x - 4, y + 4), 1)
+        pygame.draw.line(surface, accent_color, (x + 4, y - 2), (x + 4, y + 4), 1)
         
         # Cabeza con casco
-        pygame.draw.circle(screen, armor_color, (x, y - 9), 5)
-        pygame.draw.circle(screen, (100, 100, 100), (x, y - 9), 5, 1)
+        pygame.draw.circle(surface, armor_color, (x, y - 9), 5)
+        pygame.draw.circle(surface, (100, 100, 100), (x, y - 9), 5, 1)
         
         # Visera del casco
-        pygame.draw.rect(screen, (50, 50, 50), (x - 3, y - 10, 6, 3))
+        pygame.draw.rect(surface, (50, 50, 50), (x - 3, y - 10, 6, 3))
         
         # Penacho en el casco
         plume_points = [(x - 1, y - 14), (x, y - 17), (x + 1, y - 14)]
-        pygame.draw.polygon(screen, accent_color, plume_points)
+        pygame.draw.polygon(surface, accent_color, plume_points)
         
         # Escudo
         shield_x = x - 8
@@ -706,25 +1014,21 @@ class Caballero(Troop):
             (shield_x + 3, y + 4),
             (shield_x + 3, y)
         ]
-        pygame.draw.polygon(screen, accent_color, shield_points)
-        pygame.draw.polygon(screen, (255, 215, 0), shield_points, 1)
+        pygame.draw.polygon(surface, accent_color, shield_points)
+        pygame.draw.polygon(surface, (255, 215, 0), shield_points, 1)
         
         # Espada
         sword_x = x + 8
-        pygame.draw.line(screen, (200, 200, 200), (sword_x, y - 2), (sword_x, y + 8), 3)
+        pygame.draw.line(surface, (200, 200, 200), (sword_x, y - 2), (sword_x, y + 8), 3)
         # Empuñadura
-        pygame.draw.line(screen, (139, 69, 19), (sword_x - 2, y), (sword_x + 2, y), 3)
+        pygame.draw.line(surface, (139, 69, 19), (sword_x - 2, y), (sword_x + 2, y), 3)
         # Pomo
-        pygame.draw.circle(screen, (255, 215, 0), (sword_x, y + 9), 2)
-        
+        pygame.draw.circle(surface, (255, 215, 0), (sword_x, y + 9), 2)
+
+    def render(self, screen, cell_size):
+        x, y = self.get_screen_pixel(cell_size)
+        self.blit_sprite(screen, x, y)
+
         # Barra de vida
-        self._render_health_bar(screen, x, y - 20, cell_size)
+        self._render_health_bar(screen, x, y - 20, 24, 4)
 
-    def _render_health_bar(self, screen, x, y, cell_size):
-        bar_width = 24
-        bar_height = 4
-        health_percent = max(0, self.life / self.max_life)
-        
-        pygame.draw.rect(screen, (50, 50, 50), (x - bar_width//2, y, bar_width, bar_height))
-        health_color = (0, 255, 0) if health_percent > 0.5 else (255, 255, 0) if health_percent > 0.25 else (255, 0, 0)
-        pygame.draw.rect(screen, health_color, (x - bar_width//2, y, int(bar_width * health_percent), bar_height))
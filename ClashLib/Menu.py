@@ -4,6 +4,21 @@ import math
 import random
 
 
+def compute_elixir(time_elapsed, initial, max_elixir, used, wasted, seconds_per_elixir):
+    """
+    Cálculo puramente escalar del elixir a partir del tiempo transcurrido.
+    Devuelve (elixir, generado, desperdiciado) sin tocar ningún objeto.
+    """
+    generated = time_elapsed / seconds_per_elixir
+    elixir = initial + generated - used - wasted
+
+    if elixir > max_elixir:
+        elixir = max_elixir
+        wasted = initial + generated - max_elixir - used
+
+    return elixir, generated, max(0, wasted)
+
+
 class Card:
     """
     This class represents a card in the game. It will contain information about
@@ -34,6 +49,27 @@ class Menu:
         self.seconds_for_one_elixir = 2.8  # Cada 2.8 segundos se genera 1 elixir
         self.player_id = player_id
 
+        # Fuentes creadas una sola vez (el Menu se construye antes de pygame.init)
+        pygame.font.init()
+        self.cost_font = pygame.font.Font(None, 28)
+        self.name_font = pygame.font.Font(None, 24)
+        self.elixir_font = pygame.font.Font(None, 22)
+
+        # El mazo no cambia durante la partida: los textos de cada carta se rasterizan aquí
+        self.cost_texts = [self.cost_font.render(str(card.cost_elixir), True, (255, 255, 255)) for card in self.deck]
+        self.name_texts = [self.name_font.render(card.card_type, True, (255, 255, 255)) for card in self.deck]
+
+        # Solo hay max_elixir + 1 números posibles en el contador
+        self.elixir_glyphs = [self.elixir_font.render(str(n), True, (255, 255, 255)) for n in range(self.max_elixir + 1)]
+
+        # Parte estática del menú, generada en el primer render (ver render_chrome)
+        self.chrome = None
+        self.chrome_size = None
+        self.layout_size = None # tamaño para el que se calculó la geometría (ver compute_layout)
+        self.card_shells = {}  # (tamaño, seleccionada) -> superficie de la carta sin textos
+        self.segment_full = None  # segmentos de elixir ya pintados, creados en compute_layout
+        self.segment_partial = None
+
     
     def render_danger_area(self, screen):
         # Dibujar un rectángulo rojo semitransparente en la mitad que no corresponde al jugador
@@ -55,19 +91,15 @@ class Menu:
             self.elixir = self.initial_elixir
             return
 
-        # Tiempo transcurrido desde el inicio del juego
-        time_elapsed = current_synced_time - self.game_start_time
         self.last_update_time = current_synced_time
-        
-        self.generated_elixir = time_elapsed / self.seconds_for_one_elixir
-
-        self.elixir = self.initial_elixir + self.generated_elixir - self.elixir_used - self.elixir_wasted
-
-        if self.elixir > self.max_elixir:
-            self.elixir = self.max_elixir
-            self.elixir_wasted = (self.initial_elixir + self.generated_elixir) - self.max_elixir - self.elixir_used
-
-        self.elixir_wasted = max(0, self.elixir_wasted)
+        self.elixir, self.generated_elixir, self.elixir_wasted = compute_elixir(
+            current_synced_time - self.game_start_time,
+            self.initial_elixir,
+            self.max_elixir,
+            self.elixir_used,
+            self.elixir_wasted,
+            self.seconds_for_one_elixir,
+        )
 
 
     def chords_inside_menu(self, mouse_pos, menu_position, menu_size):
@@ -124,76 +156,76 @@ class Menu:
 
     def draw_rounded_rect(self, surface, color, rect, radius):
         """
-        Dibuja un rectángulo con esquinas redondeadas
+        Dibuja un rectángulo con esquinas redondeadas. pygame lo resuelve en una
+        sola primitiva (border_radius) con los mismos píxeles que dos rectángulos
+        y cuatro círculos.
         """
-        x, y, width, height = rect
-        
-        # Rectángulo principal
-        pygame.draw.rect(surface, color, (x + radius, y, width - 2*radius, height))
-        pygame.draw.rect(surface, color, (x, y + radius, width, height - 2*radius))
-        
-        # Esquinas redondeadas
-        pygame.draw.circle(surface, color, (x + radius, y + radius), radius)
-        pygame.draw.circle(surface, color, (x + width - radius, y + radius), radius)
-        pygame.draw.circle(surface, color, (x + radius, y + height - radius), radius)
-        pygame.draw.circle(surface, color, (x + width - radius, y + height - radius), radius)
+        pygame.draw.rect(surface, color, rect, border_radius=radius)
 
-    def render_card(self, screen, position, size, card_index, is_selected=False):
+    def render_card_shell(self, size, is_selected):
         """
-        Renderiza una carta individual con bordes redondeados
+        Dibuja una sola vez el cuerpo de una carta (fondo, borde de 2 px y
+        círculo de elixir) en una superficie transparente de (ancho+2, alto+2),
+        ya que el borde sobresale un píxel por cada lado
         """
-        x, y = position
         width, height = size
         radius = 8
+        shell = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
         
         # Color de fondo de la carta
         card_color = (65, 85, 140) if not is_selected else (85, 105, 160)
         
-        # Dibujar carta con bordes redondeados
-        self.draw_rounded_rect(screen, card_color, (x, y, width, height), radius)
-        
-        # Borde gris claro
+        # Borde gris claro: la carta ampliada un píxel, con el cuerpo encima
         border_color = (140, 140, 140)
-        # Simular borde redondeado dibujando múltiples rectángulos más pequeños
-        for i in range(2):
-            border_rect = (x - i, y - i, width + 2*i, height + 2*i)
-            self.draw_rounded_rect(screen, border_color, border_rect, radius + i)
-        
-        # Redibujar la carta encima del borde
-        self.draw_rounded_rect(screen, card_color, (x, y, width, height), radius)
+        self.draw_rounded_rect(shell, border_color, (0, 0, width + 2, height + 2), radius + 1)
+        self.draw_rounded_rect(shell, border_color, (1, 1, width, height), radius)
+        self.draw_rounded_rect(shell, card_color, (1, 1, width, height), radius)
         
         # Círculo de elixir en esquina superior izquierda
         elixir_radius = 18
-        elixir_center = (x + elixir_radius + 5, y + elixir_radius + 5)
+        elixir_center = (1 + elixir_radius + 5, 1 + elixir_radius + 5)
         
         # Color del elixir: #e771e8
         elixir_color = (231, 113, 232)
-        pygame.draw.circle(screen, elixir_color, elixir_center, elixir_radius)
-        pygame.draw.circle(screen, (255, 255, 255), elixir_center, elixir_radius, 3)
+        pygame.draw.circle(shell, elixir_color, elixir_center, elixir_radius)
+        pygame.draw.circle(shell, (255, 255, 255), elixir_center, elixir_radius, 3)
+
+        return shell
+
+    def render_card(self, screen, position, size, card_index, is_selected=False):
+        """
+        Renderiza una carta individual con bordes redondeados
+        """
+        x, y = position
+        width, height = size
+
+        key = (size, is_selected)
+        if key not in self.card_shells:
+            self.card_shells[key] = self.render_card_shell(size, is_selected)
+        screen.blit(self.card_shells[key], (x - 1, y - 1))
+
+        elixir_radius = 18
+        elixir_center = (x + elixir_radius + 5, y + elixir_radius + 5)
         
         # Número del costo de elixir
-        font = pygame.font.Font(None, 28)
-        cost_text = font.render(str(self.deck[card_index].cost_elixir), True, (255, 255, 255))
+        cost_text = self.cost_texts[card_index]
         cost_rect = cost_text.get_rect(center=elixir_center)
         screen.blit(cost_text, cost_rect)
 
         # Nombre de la carta provisional en el centro
-        font = pygame.font.Font(None, 24)
-        name_text = font.render(self.deck[card_index].card_type, True, (255, 255, 255))
+        name_text = self.name_texts[card_index]
         name_rect = name_text.get_rect(center=(x + width // 2, y + height // 2))
         screen.blit(name_text, name_rect)   
 
 
-    def render(self, screen, position=(0, 32*20), size=(18*20, 8*20)):
+    def compute_layout(self, size):
         """
-        Renderiza el menú con el diseño correcto
+        Calcula una sola vez (por tamaño de menú) la geometría de las cartas y de
+        la barra de elixir, relativa a la esquina del menú. La usan render_chrome,
+        la capa dinámica del render y handle_click.
         """
-        x, y = position
         width, height = size
-        
-        # Fondo del menú - azul intenso
-        pygame.draw.rect(screen, (20, 80, 150), (x, y, width, height))
-        
+
         # Configuración de las cartas
         num_cards = 4
         card_margin = 8
@@ -205,89 +237,120 @@ class Menu:
         card_width = (available_width - total_spacing) // num_cards
         card_height = height - 60  # Dejar más espacio para el elixir abajo
         
-        # Renderizar las 4 cartas
-        for i in range(num_cards):
-            card_x = x + card_padding + i * (card_width + card_spacing)
-            card_y = y + 15
-            
-            is_selected = (self.selected_card == i)
-            self.render_card(
-                screen, 
-                (card_x, card_y), 
-                (card_width, card_height), 
-                i, 
-                is_selected
-            )
-        
-        # Contador de elixir centrado en la parte inferior
-        self.render_elixir_counter(screen, x, y, width, height)
-        
-        if self.selected_card is not None: 
-            self.render_danger_area(screen)
+        self.card_size = (card_width, card_height)
+        self.card_positions = [(card_padding + i * (card_width + card_spacing), 15) for i in range(num_cards)]
+        # Zonas de clic: +1 porque collidepoint excluye el borde derecho e inferior
+        self.card_hitboxes = [pygame.Rect(card_x, card_y, card_width + 1, card_height + 1) for card_x, card_y in self.card_positions]
 
-    def render_elixir_counter(self, screen, menu_x, menu_y, menu_width, menu_height):
-        """
-        Renderiza el contador de elixir con divisiones como en Clash Royale
-        """
         # Configuración de la barra - más larga, ocupando casi todo el ancho
-        bar_width = menu_width - 90  # Dejar márgenes pequeños
+        bar_width = width - 90  # Dejar márgenes pequeños
         bar_height = 20
-        bar_x = menu_x + 60  # Margen izquierdo
-        bar_y = menu_y + menu_height - bar_height - 15
+        bar_x = 60  # Margen izquierdo
+        bar_y = height - bar_height - 15
+        self.elixir_bar = (bar_x, bar_y, bar_width, bar_height)
+
+        # Círculo de elixir a la izquierda
+        self.elixir_circle_center = (bar_x - 25, bar_y + bar_height // 2)
+
+        # Segmentos de la barra, con un pequeño margen
+        self.segment_width = bar_width / self.max_elixir
+        margin = 1
+        self.elixir_segments = [
+            pygame.Rect(bar_x + i * self.segment_width + margin, bar_y + margin,
+                        self.segment_width - 2*margin, bar_height - 2*margin)
+            for i in range(self.max_elixir)
+        ]
+
+        # Segmentos lleno y parcialmente lleno, listos para estampar con blits
+        self.segment_full = pygame.Surface(self.elixir_segments[0].size)
+        self.segment_full.fill((231, 113, 232))  # #e771e8
+        self.segment_partial = pygame.Surface(self.elixir_segments[0].size)
+        self.segment_partial.fill((100, 79, 127))
+
+        self.layout_size = size
+
+    def render_chrome(self, width, height):
+        """
+        Dibuja en una superficie propia todo lo estático del menú: fondo, las
+        cartas sin seleccionar, el círculo del contador y la barra vacía.
+        """
+        if self.layout_size != (width, height):
+            self.compute_layout((width, height))
+        chrome = pygame.Surface((width, height))
+
+        # Fondo del menú - azul intenso
+        chrome.fill((20, 80, 150))
         
+        # Renderizar las 4 cartas
+        for i, card_position in enumerate(self.card_positions):
+            self.render_card(chrome, card_position, self.card_size, i)
+
         # Círculo de elixir a la izquierda
         circle_radius = 15
-        circle_center = (bar_x - 25, bar_y + bar_height // 2)
-        
-        # Dibujar círculo con el número de elixir
-        pygame.draw.circle(screen, (231, 113, 232), circle_center, circle_radius)  # #e771e8
-        pygame.draw.circle(screen, (255, 255, 255), circle_center, circle_radius, 2)
+        pygame.draw.circle(chrome, (231, 113, 232), self.elixir_circle_center, circle_radius)  # #e771e8
+        pygame.draw.circle(chrome, (255, 255, 255), self.elixir_circle_center, circle_radius, 2)
+
+        # Fondo de la barra (negro) y todos los segmentos vacíos
+        pygame.draw.rect(chrome, (0, 0, 0), self.elixir_bar)
+        for segment in self.elixir_segments:
+            chrome.fill((60, 60, 60), segment)
+
+        return chrome
+
+    def render(self, screen, position=(0, 32*20), size=(18*20, 8*20)):
+        """
+        Renderiza el menú con el diseño correcto. La parte estática se dibuja una
+        vez por tamaño; cada frame solo se pinta la carta seleccionada y el elixir.
+        """
+        x, y = position
+
+        if self.chrome_size != size:
+            self.chrome = self.render_chrome(*size)
+            self.chrome_size = size
+        screen.blit(self.chrome, position)
+
+        if self.selected_card is not None:
+            # Recortado al borde de la carta: el nombre puede sobresalir y lo que
+            # queda fuera ya está en el fondo (no se debe mezclar dos veces)
+            card_x, card_y = self.card_positions[self.selected_card]
+            card_x += x
+            card_y += y
+            card_width, card_height = self.card_size
+            previous_clip = screen.get_clip()
+            screen.set_clip(pygame.Rect(card_x - 1, card_y - 1, card_width + 2, card_height + 2).clip(previous_clip))
+            self.render_card(screen, (card_x, card_y), self.card_size, self.selected_card, True)
+            screen.set_clip(previous_clip)
         
+        # Contador de elixir centrado en la parte inferior
+        self.render_elixir_counter(screen, x, y)
+
+    def render_elixir_counter(self, screen, menu_x, menu_y):
+        """
+        Renderiza la parte variable del contador de elixir (número y segmentos
+        llenos) sobre la barra vacía que ya trae el fondo del menú
+        """
+        # Si aún no hubo un render, la geometría se calcula con el tamaño por defecto
+        if self.layout_size is None:
+            self.compute_layout((18*20, 8*20))
+
         # Texto del elixir en el círculo
-        font = pygame.font.Font(None, 22)
-        elixir_text = font.render(f"{int(self.elixir)}", True, (255, 255, 255))
+        circle_center = (menu_x + self.elixir_circle_center[0], menu_y + self.elixir_circle_center[1])
+        elixir_text = self.elixir_glyphs[int(self.elixir)]
         text_rect = elixir_text.get_rect(center=circle_center)
         screen.blit(elixir_text, text_rect)
         
-        # Fondo de la barra (negro)
-        pygame.draw.rect(screen, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height))
-        
-        # Calcular el ancho de cada segmento de elixir
-        segment_width = bar_width / self.max_elixir
+        # Segmentos llenos en una sola llamada; los vacíos ya están en el fondo
+        full_segments = int(self.elixir)
+        screen.blits([(self.segment_full, segment.move(menu_x, menu_y)) for segment in self.elixir_segments[:full_segments]], doreturn=0)
         
-        # Dibujar cada segmento de elixir
-        for i in range(self.max_elixir):
-            segment_x = bar_x + i * segment_width
-            
-            # Color del segmento
-            if i < int(self.elixir):
-                # Segmento lleno
-                segment_color = (231, 113, 232)  # #e771e8
-            elif i < self.elixir:
-                # Segmento parcialmente lleno
-                segment_color = (100, 79, 127)
-            else:
-                # Segmento vacío
-                segment_color = (60, 60, 60)
+        # Si hay elixir parcial, el segmento en curso se pinta de fondo tenue
+        # y encima la fracción ya generada
+        if self.elixir != full_segments and full_segments < self.max_elixir:
+            segment = self.elixir_segments[full_segments].move(menu_x, menu_y)
+            screen.blit(self.segment_partial, segment)
             
-            # Dibujar el segmento con un pequeño margen
-            margin = 1
-            pygame.draw.rect(screen, segment_color, 
-                           (segment_x + margin, bar_y + margin, 
-                            segment_width - 2*margin, bar_height - 2*margin))
-        
-        # Si hay elixir parcial, dibujarlo
-        if self.elixir != int(self.elixir):
-            partial_segment = int(self.elixir)
-            if partial_segment < self.max_elixir:
-                partial_progress = self.elixir - partial_segment
-                partial_x = bar_x + partial_segment * segment_width
-                partial_width = segment_width * partial_progress
-                
-                margin = 1
-                pygame.draw.rect(screen, (231, 113, 232),
-                               (partial_x + margin, bar_y + margin,
-                                partial_width - 2*margin, bar_height - 2*margin))
+            partial_width = self.segment_width * (self.elixir - full_segments)
+            screen.fill((231, 113, 232), (segment.x, segment.y, partial_width - 2, segment.height))
 
     def handle_click(self, mouse_pos, menu_position, menu_size):
         """
@@ -301,20 +364,12 @@ class Menu:
             return False
         
         # Calcular en qué carta se hizo clic
-        num_cards = 4
-        card_margin = 8
-        card_padding = 15
-        
-        available_width = width - (2 * card_padding)
-        card_spacing = card_margin
-        total_spacing = card_spacing * (num_cards - 1)
-        card_width = (available_width - total_spacing) // num_cards
-        card_height = height - 60
+        if self.layout_size != menu_size:
+            self.compute_layout(menu_size)
         
-        for i in range(num_cards):
-            card_x = x + card_padding + i * (card_width + card_spacing)
-            card_y = y + 15
-            
-            if (card_x <= mouse_pos[0] <= card_x + card_width and 
-                card_y <= mouse_pos[1] <= card_y + card_height):
+        # Coordenadas del clic relativas al menú, como las zonas de clic
+        local_pos = (mouse_pos[0] - x, mouse_pos[1] - y)
+        for i, hitbox in enumerate(self.card_hitboxes):
+            if hitbox.collidepoint(local_pos):
                 self.selected_card = i
+                break
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import heapq
 
 
 class Event:
@@ -21,7 +22,6 @@ class Event:
 
     def from_json(json_data):
         try:
-            print(json_data)
             return Event(
                 event_type=json_data["event_type"],
                 timestamp=json_data["timestamp"],
@@ -69,33 +69,40 @@ class GameTimeline(ABC):
     the simulation time and the events that had occurred in the game.
     Attributes:
         simulation_time (int): The current time in the simulation.
-        events (list): A list of events that have occurred in the game.
+        events (list): Heap of pending (aparition_time, seq, event) entries; processed events are popped.
         tick_time (float): The time unit for each step in the simulation (e.g., 1/24 for 24 FPS).
     """
     def __init__(self, tick_time=1/24):
         self.simulation_time = 0
         self.tick_time = tick_time
         self.events = []
-
-    def get_events_in_range(self, start_time, end_time):
-        return [event for event in self.events if start_time <= event.aparition_time <= end_time]
+        self.event_seq = 0 # desempata eventos con el mismo aparition_time por orden de llegada
 
     def add_event(self, event):
-        self.events.append(event)
-        self.events.sort(key=lambda e: e.aparition_time)
+        heapq.heappush(self.events, (event.aparition_time, self.event_seq, event))
+        self.event_seq += 1
 
     def execute_tick(self, game_state):
         """
         Execute a single tick of the simulation, updating the game state and processing events.
+        Only the head of the heap is checked, so ticks without due events cost O(1).
         """
         game_state.update(self.tick_time)
 
-        current_events = self.get_events_in_range(self.simulation_time, self.simulation_time + self.tick_time)
-        for event in current_events:
+        end_time = self.simulation_time + self.tick_time
+        while self.events and self.events[0][0] <= end_time:
+            _, _, event = heapq.heappop(self.events)
             self.process_event(event, game_state)
 
         self.simulation_time += self.tick_time
 
+    def execute_ticks(self, game_state, n):
+        """
+        Execute n consecutive ticks.
+        """
+        for _ in range(n):
+            self.execute_tick(game_state)
+
     
     @abstractmethod
     def process_event(self, event, game_state):
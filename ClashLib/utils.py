@@ -59,6 +59,9 @@ grid_to_screen(grid_x, grid_y, cell_size)
 format_time(seconds)
 random_point_in_circle(center, radius)
 smooth_step(edge0, edge1, x)
+swap_remove_inactive(items)
+morton_code(x, y)
+splitmix64(value)
 
 CLASES DISPONIBLES:
 
@@ -89,9 +92,6 @@ Rectangle:
     - contains(point)
     - intersects(other)
 
-AStarNode:
-    - __init__(position, g_cost, h_cost, parent)
-
 
 EJEMPLO DE USO:
 
@@ -268,23 +268,8 @@ class Rectangle:
 # ALGORITMOS DE PATHFINDING
 # =============================================================================
 
-class AStarNode:
-    def __init__(self, position: Tuple[int, int], g_cost: float = 0, h_cost: float = 0, parent=None):
-        self.position = position
-        self.g_cost = g_cost  # Costo desde el inicio
-        self.h_cost = h_cost  # Heurística hasta el objetivo
-        self.f_cost = g_cost + h_cost  # Costo total
-        self.parent = parent
-    
-    def __lt__(self, other):
-        return self.f_cost < other.f_cost
-    
-    def __eq__(self, other):
-        return self.position == other.position
-
-
 def heuristic_distance(pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
-    """Distancia Manhattan para A*"""
+    """Distancia Manhattan entre dos celdas (a_star usa la distancia octil)"""
     return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
 
@@ -308,6 +293,49 @@ def get_neighbors(position: Tuple[int, int], grid_width: int, grid_height: int)
     return neighbors
 
 
+class AStarScratch:
+    """
+    Buffers reutilizables de a_star, en listas planas indexadas por y * ancho + x.
+    Cada búsqueda usa un número de consulta nuevo: una celda solo cuenta como
+    vista/cerrada si su sello coincide con la consulta actual, así no hace falta
+    limpiar los buffers entre búsquedas (solo se crean al cambiar el tamaño).
+    """
+    def __init__(self):
+        self.size = 0
+        self.query = 0
+        self.g_cost = []
+        self.came_from = []
+        self.seen = []
+        self.closed = []
+        self.open_set = []
+
+    def begin(self, size: int) -> int:
+        if size != self.size:
+            self.size = size
+            self.query = 0
+            self.g_cost = [0.0] * size
+            self.came_from = [-1] * size
+            self.seen = [0] * size
+            self.closed = [0] * size
+        self.query += 1
+        self.open_set.clear()
+        return self.query
+
+
+ASTAR_SCRATCH = AStarScratch()
+
+# 8 direcciones (incluye diagonales), en el mismo orden que get_neighbors
+ASTAR_DIRECTIONS = (
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1)
+)
+
+# costo de un paso diagonal (√2 aproximado); la heurística octil usa el mismo
+# valor, así nunca sobreestima y el camino devuelto es de costo mínimo
+ASTAR_DIAGONAL_COST = 1.414
+
+
 def a_star(start: Tuple[int, int], goal: Tuple[int, int], 
           grid_width: int, grid_height: int, 
           obstacles: set = None) -> Optional[List[Tuple[int, int]]]:
@@ -332,52 +360,78 @@ def a_star(start: Tuple[int, int], goal: Tuple[int, int],
     
     if goal in obstacles:
         return None
-    
-    open_set = []
-    closed_set = set()
-    
-    start_node = AStarNode(start, 0, heuristic_distance(start, goal))
-    heapq.heappush(open_set, start_node)
+
+    # los buffers son planos (y * ancho + x): una celda fuera de la grid
+    # caería sobre otra real, así que se rechaza antes de indexar
+    start_x, start_y = start
+    goal_x, goal_y = goal
+    if not (0 <= start_x < grid_width and 0 <= start_y < grid_height):
+        return None
+    if not (0 <= goal_x < grid_width and 0 <= goal_y < grid_height):
+        return None
+
+    scratch = ASTAR_SCRATCH
+    query = scratch.begin(grid_width * grid_height)
+    g_cost = scratch.g_cost
+    came_from = scratch.came_from
+    seen = scratch.seen
+    closed = scratch.closed
+    open_set = scratch.open_set
+
+    goal_index = goal_y * grid_width + goal_x
+    start_index = start_y * grid_width + start_x
+
+    g_cost[start_index] = 0.0
+    came_from[start_index] = -1
+    seen[start_index] = query
+    # heurística octil: los pasos diagonales cubren min(hx, hy) y el resto es recto
+    diagonal_extra = ASTAR_DIAGONAL_COST - 1.0
+    hx, hy = abs(start_x - goal_x), abs(start_y - goal_y)
+    h = hx + diagonal_extra * hy if hx > hy else hy + diagonal_extra * hx
+
+    # (f, orden de llegada, índice): el contador desempata sin comparar nodos
+    order = 0
+    heapq.heappush(open_set, (h, order, start_index))
     
     while open_set:
-        current_node = heapq.heappop(open_set)
+        _, _, index = heapq.heappop(open_set)
+        if closed[index] == query:
+            continue # entrada vieja: la celda ya se expandió con un costo menor
         
-        if current_node.position == goal:
+        if index == goal_index:
             # Reconstruir el camino
             path = []
-            while current_node:
-                path.append(current_node.position)
-                current_node = current_node.parent
+            while index != -1:
+                path.append((index % grid_width, index // grid_width))
+                index = came_from[index]
             return path[::-1]
         
-        closed_set.add(current_node.position)
+        closed[index] = query
+        x, y = index % grid_width, index // grid_width
+        current_g = g_cost[index]
         
-        for neighbor_pos in get_neighbors(current_node.position, grid_width, grid_height):
-            if neighbor_pos in closed_set or neighbor_pos in obstacles:
+        for dx, dy in ASTAR_DIRECTIONS:
+            new_x, new_y = x + dx, y + dy
+            if not (0 <= new_x < grid_width and 0 <= new_y < grid_height):
+                continue
+            neighbor = new_y * grid_width + new_x
+            if closed[neighbor] == query or (new_x, new_y) in obstacles:
                 continue
             
             # Costo de movimiento (diagonal cuesta más)
-            dx = abs(neighbor_pos[0] - current_node.position[0])
-            dy = abs(neighbor_pos[1] - current_node.position[1])
-            move_cost = 1.414 if dx + dy == 2 else 1.0  # √2 para diagonales
-            
-            g_cost = current_node.g_cost + move_cost
-            h_cost = heuristic_distance(neighbor_pos, goal)
+            move_cost = ASTAR_DIAGONAL_COST if dx and dy else 1.0
+            g = current_g + move_cost
             
-            neighbor_node = AStarNode(neighbor_pos, g_cost, h_cost, current_node)
-            
-            # Verificar si ya está en open_set con menor costo
-            existing_node = None
-            for node in open_set:
-                if node.position == neighbor_pos:
-                    existing_node = node
-                    break
-            
-            if existing_node is None or g_cost < existing_node.g_cost:
-                if existing_node:
-                    open_set.remove(existing_node)
-                    heapq.heapify(open_set)
-                heapq.heappush(open_set, neighbor_node)
+            # Solo se encola si es la primera vez que se ve o si mejora el costo;
+            # la entrada anterior queda en el heap y se descarta al salir
+            if seen[neighbor] != query or g < g_cost[neighbor]:
+                seen[neighbor] = query
+                g_cost[neighbor] = g
+                came_from[neighbor] = index
+                hx, hy = abs(new_x - goal_x), abs(new_y - goal_y)
+                h = hx + diagonal_extra * hy if hx > hy else hy + diagonal_extra * hx
+                order += 1
+                heapq.heappush(open_set, (g + h, order, neighbor))
     
     return None  # No se encontró camino
 
@@ -487,13 +541,18 @@ def normalize_angle(angle: float) -> float:
 # =============================================================================
 
 def point_in_circle(point: Point, center: Point, radius: float) -> bool:
-    """Verifica si un punto está dentro de un círculo"""
-    return point.distance_to(center) <= radius
+    """Verifica si un punto está dentro de un círculo (distancias al cuadrado, sin sqrt)"""
+    dx = point.x - center.x
+    dy = point.y - center.y
+    return dx * dx + dy * dy <= radius * radius
 
 
 def circle_circle_collision(center1: Point, radius1: float, center2: Point, radius2: float) -> bool:
-    """Verifica colisión entre dos círculos"""
-    return center1.distance_to(center2) <= (radius1 + radius2)
+    """Verifica colisión entre dos círculos (distancias al cuadrado, sin sqrt)"""
+    dx = center1.x - center2.x
+    dy = center1.y - center2.y
+    reach = radius1 + radius2
+    return dx * dx + dy * dy <= reach * reach
 
 
 def point_in_rect(point: Point, rect: Rectangle) -> bool:
@@ -612,4 +671,45 @@ def random_point_in_circle(center: Point, radius: float) -> Point:
 def smooth_step(edge0: float, edge1: float, x: float) -> float:
     """Función smoothstep para transiciones suaves"""
     t = clamp((x - edge0) / (edge1 - edge0), 0.0, 1.0)
-    return t * t * (3.0 - 2.0 * t)
\ No newline at end of file
+    return t * t * (3.0 - 2.0 * t)
+
+
+def swap_remove_inactive(items: list, on_remove=None) -> None:
+    """
+    Elimina in-place los elementos con active == False.
+    Cada hueco se rellena con el último elemento vivo (no conserva el orden),
+    así no se crea una lista nueva en cada tick.
+    Si se pasa on_remove, se llama una vez con cada elemento eliminado.
+    """
+    i = 0
+    n = len(items)
+    while i < n:
+        if items[i].active:
+            i += 1
+        else:
+            if on_remove is not None:
+                on_remove(items[i])
+            n -= 1
+            items[i] = items[n]
+    del items[n:]
+
+
+def morton_code(x: int, y: int) -> int:
+    """Intercala los bits de x e y (orden Z) para coordenadas de hasta 16 bits"""
+    def spread(v):
+        v &= 0xFFFF
+        v = (v | (v << 8)) & 0x00FF00FF
+        v = (v | (v << 4)) & 0x0F0F0F0F
+        v = (v | (v << 2)) & 0x33333333
+        v = (v | (v << 1)) & 0x55555555
+        return v
+    return spread(x) | (spread(y) << 1)
+
+
+def splitmix64(value: int) -> int:
+    """Hash entero de 64 bits (splitmix64): ruido determinista sin estado de PRNG"""
+    mask = 0xFFFFFFFFFFFFFFFF
+    z = (value + 0x9E3779B97F4A7C15) & mask
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & mask
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & mask
+    return z ^ (z >> 31)